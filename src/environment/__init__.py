@@ -6,6 +6,22 @@ from .social_gridworld import (
     NPCMood,
     GridState,
     Transition,
+    RewardChannels,
+    EnvSnapshot,
+    RolloutResult,
+    ExhaustiveEvaluation,
+    generate_mood_schedule,
+    mood_change_episodes,
+)
+from .async_vector import AsyncVectorSocialGridWorld
+from .distance_fields import DistanceFields, path_efficiency, potential_shaping
+from .episode_stats import EpisodeStats
+from .layout import layout_from_ascii, load_layout, save_layout
+from .state_codec import GridStateCodec
+from .tabular_mdp import TabularMDP, export_tabular_mdp
+from .vector_gridworld import (
+    VectorSocialGridWorld,
+    VectorStep,
 )
 
 __all__ = [
@@ -14,4 +30,23 @@ __all__ = [
     "NPCMood",
     "GridState",
     "Transition",
+    "RewardChannels",
+    "EnvSnapshot",
+    "RolloutResult",
+    "ExhaustiveEvaluation",
+    "generate_mood_schedule",
+    "mood_change_episodes",
+    "GridStateCodec",
+    "VectorSocialGridWorld",
+    "VectorStep",
+    "AsyncVectorSocialGridWorld",
+    "EpisodeStats",
+    "DistanceFields",
+    "path_efficiency",
+    "potential_shaping",
+    "TabularMDP",
+    "export_tabular_mdp",
+    "save_layout",
+    "load_layout",
+    "layout_from_ascii",
 ]
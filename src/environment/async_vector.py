@@ -0,0 +1,355 @@
+"""
+AsyncVectorSocialGridWorld: SimpleSocialGridWorld lanes stepped in worker processes.
+
+Conceptual Framework:
+    Some agents have per-step logic that does not vectorize. Splitting lanes
+    across worker processes lets the learner overlap its own computation with
+    environment stepping: step_async() hands actions to the workers and
+    returns immediately, step_wait() collects the results.
+
+Methodological Design Decisions:
+    1. Actions, observations, rewards and error channels live in
+       multiprocessing.shared_memory arrays; pipes only carry short commands
+    2. Each worker owns a contiguous slice of lanes and steps them with
+       SimpleSocialGridWorld.step_fast (no GridState/Transition objects)
+    3. Finished lanes are reset by the worker in the same step (autoreset),
+       matching VectorSocialGridWorld(autoreset=True) result semantics
+"""
+
+import multiprocessing as mp
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.context import DefaultContext
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, cast
+
+import numpy as np
+
+from .seeding import SeedLike
+from .social_gridworld import SimpleSocialGridWorld, validate_actions
+from .vector_gridworld import VectorStep
+
+# Shared buffer layout: field name -> dtype (all buffers have num_envs entries)
+_BUFFER_DTYPES: dict[str, type] = {
+    "actions": np.int64,
+    "obs": np.int64,
+    "final_obs": np.int64,
+    "reward": np.float64,
+    "done": np.bool_,
+    "state_error": np.float32,
+    "agent_error": np.float32,
+    "episode_return": np.float64,
+    "episode_length": np.int32,
+    "state_reward": np.float32,
+    "agent_reward": np.float32,
+}
+
+
+def _attach_buffers(
+    names: dict[str, str], num_envs: int
+) -> tuple[list[SharedMemory], dict[str, np.ndarray]]:
+    """Attach to shared buffers created by the parent process."""
+    blocks = []
+    arrays = {}
+    for field, name in names.items():
+        # Workers share the parent's resource tracker; the parent unlinks
+        block = SharedMemory(name=name)
+        blocks.append(block)
+        arrays[field] = np.ndarray(num_envs, dtype=_BUFFER_DTYPES[field], buffer=block.buf)
+    return blocks, arrays
+
+
+def _worker(
+    conn: Connection,
+    start: int,
+    names: dict[str, str],
+    num_envs: int,
+    seeds: list[SeedLike],
+    env_kwargs: dict[str, Any],
+) -> None:
+    """Worker process entry point: attach buffers, serve commands, clean up."""
+    blocks, buffers = _attach_buffers(names, num_envs)
+    try:
+        # Startup handshake: construction errors (e.g. bad env_kwargs) reach the parent
+        try:
+            envs = [SimpleSocialGridWorld(seed=seed, **env_kwargs) for seed in seeds]
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+            return
+        conn.send(("ok", None))
+        _serve(conn, envs, buffers, start)
+    finally:
+        # Views must be released before the shared blocks can be closed
+        buffers.clear()
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+def _serve(
+    conn: Connection,
+    envs: list[SimpleSocialGridWorld],
+    buffers: dict[str, np.ndarray],
+    start: int,
+) -> None:
+    """Worker loop: step a contiguous slice of lanes on command from the parent."""
+    returns = [0.0] * len(envs)
+    lengths = [0] * len(envs)
+
+    actions = buffers["actions"]
+    obs = buffers["obs"]
+    final_obs = buffers["final_obs"]
+    reward = buffers["reward"]
+    done = buffers["done"]
+    state_error = buffers["state_error"]
+    agent_error = buffers["agent_error"]
+    state_reward = buffers["state_reward"]
+    agent_reward = buffers["agent_reward"]
+    episode_return = buffers["episode_return"]
+    episode_length = buffers["episode_length"]
+
+    while True:
+        command = conn.recv()
+        try:
+            if command == "reset":
+                for i, env in enumerate(envs):
+                    obs[start + i] = env.reset_fast()
+                    returns[i] = 0.0
+                    lengths[i] = 0
+
+            elif command == "step":
+                for i, env in enumerate(envs):
+                    lane = start + i
+                    index, r, finished = env.step_fast(int(actions[lane]))
+                    returns[i] += r
+                    lengths[i] += 1
+
+                    reward[lane] = r
+                    done[lane] = finished
+                    state_error[lane] = env.last_state_error
+                    agent_error[lane] = env.last_agent_error
+                    state_reward[lane] = env.last_state_reward
+                    agent_reward[lane] = env.last_agent_reward
+                    final_obs[lane] = index
+
+                    if finished:
+                        episode_return[lane] = returns[i]
+                        episode_length[lane] = lengths[i]
+                        obs[lane] = env.reset_fast()
+                        returns[i] = 0.0
+                        lengths[i] = 0
+                    else:
+                        episode_return[lane] = 0.0
+                        episode_length[lane] = 0
+                        obs[lane] = index
+
+            elif command == "close":
+                conn.send(("ok", None))
+                return
+
+            else:
+                raise ValueError(f"Unknown command: {command!r}")
+
+            conn.send(("ok", None))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+
+
+class AsyncVectorSocialGridWorld:
+    """
+    SimpleSocialGridWorld lanes distributed over worker processes.
+
+    Usage Pattern:
+        env.step_async(actions)   # workers start stepping
+        ...                       # learner computes in parallel
+        result = env.step_wait()  # VectorStep, same fields as VectorSocialGridWorld
+
+    Implementation Notes:
+        - Results are copies of the shared buffers, safe to keep across steps
+        - Lanes always autoreset (final_obs holds the terminal state)
+        - Call close() (or use as a context manager) to stop workers and
+          release shared memory
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_workers: int = 2,
+        seed: SeedLike = None,
+        context: str | None = None,
+        **env_kwargs: Any,
+    ):
+        """
+        Start worker processes and allocate shared buffers.
+
+        Args:
+            num_envs: Total number of lanes
+            num_workers: Number of worker processes (capped at num_envs)
+            seed: Root seed; lane i uses SeedSequence(seed, spawn_key=(i,)),
+                the same lane streams as VectorSocialGridWorld
+            context: multiprocessing start method (None = platform default)
+            **env_kwargs: Forwarded to every SimpleSocialGridWorld
+        """
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be positive, got {num_workers}")
+
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers, num_envs)
+        self._waiting = False
+        self._closed = False
+        self._blocks: list[SharedMemory] = []
+        self._buffers: dict[str, np.ndarray] = {}
+        self._conns: list[Connection] = []
+        self._processes: list[BaseProcess] = []
+
+        try:
+            self._start(seed, context, env_kwargs)
+        except BaseException:
+            # Failed startup must not leak workers or shared memory blocks
+            self.close()
+            raise
+
+    def _start(self, seed: SeedLike, context: str | None, env_kwargs: dict[str, Any]) -> None:
+        """Allocate shared buffers, start workers and wait for their handshake."""
+        num_envs = self.num_envs
+        names = {}
+        for field, dtype in _BUFFER_DTYPES.items():
+            nbytes = num_envs * np.dtype(dtype).itemsize
+            block = SharedMemory(create=True, size=nbytes)
+            self._blocks.append(block)
+            self._buffers[field] = np.ndarray(num_envs, dtype=dtype, buffer=block.buf)
+            self._buffers[field][:] = 0
+            names[field] = block.name
+
+        # Independent per-lane seeds from the root's spawn tree
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        lane_seeds: list[SeedLike] = list(root.spawn(num_envs))
+
+        # Every start method's context provides Process; the BaseContext stub does not
+        ctx = cast(DefaultContext, mp.get_context(context))
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    child_conn,
+                    int(start),
+                    names,
+                    num_envs,
+                    lane_seeds[start:stop],
+                    env_kwargs,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        self._collect()
+
+    def reset(self) -> np.ndarray:
+        """Reset every lane; returns state indices (see GridStateCodec)."""
+        self._check_open()
+        if self._waiting:
+            raise RuntimeError("Cannot reset while a step is pending; call step_wait() first")
+        self._broadcast("reset")
+        self._collect()
+        return self._buffers["obs"].copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Write actions to shared memory and start stepping in the workers."""
+        self._check_open()
+        if self._waiting:
+            raise RuntimeError("step_async() called twice without step_wait()")
+
+        actions = validate_actions(actions, self.num_envs)
+
+        self._buffers["actions"][:] = actions
+        self._broadcast("step")
+        self._waiting = True
+
+    def step_wait(self) -> VectorStep:
+        """Block until all workers finished the pending step."""
+        if not self._waiting:
+            raise RuntimeError("step_wait() called without step_async()")
+        self._waiting = False
+        self._collect()
+
+        buffers = self._buffers
+        return VectorStep(
+            reward=buffers["reward"].copy(),
+            done=buffers["done"].copy(),
+            state_error=buffers["state_error"].copy(),
+            agent_error=buffers["agent_error"].copy(),
+            obs=buffers["obs"].copy(),
+            final_obs=buffers["final_obs"].copy(),
+            episode_return=buffers["episode_return"].copy(),
+            episode_length=buffers["episode_length"].copy(),
+            state_reward=buffers["state_reward"].copy(),
+            agent_reward=buffers["agent_reward"].copy(),
+        )
+
+    def step(self, actions: np.ndarray) -> VectorStep:
+        """Synchronous step (step_async followed by step_wait)."""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """Stop workers and release shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._waiting:
+            # Drain the pending step; its errors must not stop the cleanup below
+            self._waiting = False
+            try:
+                self._collect()
+            except (RuntimeError, ConnectionError, EOFError):
+                pass
+
+        for conn in self._conns:
+            try:
+                conn.send("close")
+                conn.recv()
+            except (ConnectionError, EOFError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+        self._buffers.clear()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self) -> "AsyncVectorSocialGridWorld":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Environment is closed")
+
+    def _broadcast(self, command: str) -> None:
+        for conn in self._conns:
+            conn.send(command)
+
+    def _collect(self) -> None:
+        """Wait for every worker's reply, raising the first worker error."""
+        errors = []
+        for conn in self._conns:
+            status, payload = conn.recv()
+            if status == "error":
+                errors.append(payload)
+        if errors:
+            raise RuntimeError(f"Worker failed:\n{errors[0]}")
@@ -0,0 +1,175 @@
+"""
+Bounded Streaming Episode Statistics
+
+Conceptual Purpose:
+    Long runs need episode returns for learning curves and convergence
+    metrics, but an ever-growing Python list leaks memory. EpisodeStats keeps
+    the most recent episodes in fixed-capacity ring buffers and maintains
+    running summaries over every episode ever recorded.
+
+Methodological Design:
+    - Ring buffers (return, length, success) hold the last `capacity` episodes
+    - Running mean/variance of returns and lengths use Welford's update
+      (Chan et al.'s pairwise merge for batches), O(1) per episode and
+      numerically stable over millions of episodes
+    - The windowed success rate keeps a running count of successes among the
+      last `window` episodes: add the new flag, subtract the one leaving
+"""
+
+import numpy as np
+
+
+class EpisodeStats:
+    """
+    Fixed-memory record of episode returns, lengths and goal success.
+
+    Usage Pattern:
+        stats = EpisodeStats(capacity=10_000, window=100)
+        stats.add(episode_return, length, success)
+        stats.mean_return, stats.success_rate, stats.returns()
+    """
+
+    def __init__(self, capacity: int = 10_000, window: int = 100):
+        """
+        Args:
+            capacity: Most recent episodes retained for export
+            window: Episodes in the windowed success rate (at most capacity)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if not 1 <= window <= capacity:
+            raise ValueError(f"window must be in [1, {capacity}], got {window}")
+
+        self.capacity = capacity
+        self.window = window
+
+        self._returns = np.zeros(capacity)
+        self._lengths = np.zeros(capacity, dtype=np.int32)
+        self._success = np.zeros(capacity, dtype=bool)
+        self._next = 0  # Ring position of the next episode
+
+        self.count = 0  # Episodes recorded in total
+        self._window_successes = 0
+
+        # Welford accumulators over all episodes
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+        self._length_mean = 0.0
+        self._length_m2 = 0.0
+
+    def __len__(self) -> int:
+        """Episodes currently retained."""
+        return min(self.count, self.capacity)
+
+    def add(self, episode_return: float, length: int, success: bool) -> None:
+        """Record one finished episode in O(1)."""
+        i = self._next
+        if self.count >= self.window:
+            self._window_successes -= int(self._success[(i - self.window) % self.capacity])
+        self._window_successes += int(success)
+
+        self._returns[i] = episode_return
+        self._lengths[i] = length
+        self._success[i] = success
+        self._next = (i + 1) % self.capacity
+
+        self.count += 1
+        delta = episode_return - self._return_mean
+        self._return_mean += delta / self.count
+        self._return_m2 += delta * (episode_return - self._return_mean)
+        delta = length - self._length_mean
+        self._length_mean += delta / self.count
+        self._length_m2 += delta * (length - self._length_mean)
+
+    def add_batch(self, returns: np.ndarray, lengths: np.ndarray, success: np.ndarray) -> None:
+        """Record several finished episodes (in order) with array operations."""
+        returns = np.asarray(returns, dtype=np.float64)
+        lengths = np.asarray(lengths)
+        success = np.asarray(success, dtype=bool)
+        n = returns.size
+        if n == 0:
+            return
+
+        # Windowed success count in O(n) like add(): episode e sits in slot
+        # e % capacity, so read the episodes leaving the window before the
+        # ring write can overwrite them
+        if n >= self.window:
+            self._window_successes = int(success[-self.window:].sum())
+        else:
+            leaving = np.arange(self.count - self.window, self.count - self.window + n)
+            leaving = leaving[leaving >= 0] % self.capacity
+            self._window_successes += int(success.sum()) - int(self._success[leaving].sum())
+
+        # Only the last `capacity` episodes survive in the ring
+        keep = slice(max(0, n - self.capacity), n)
+        slots = (self._next + np.arange(n)[keep]) % self.capacity
+        self._returns[slots] = returns[keep]
+        self._lengths[slots] = lengths[keep]
+        self._success[slots] = success[keep]
+        self._next = (self._next + n) % self.capacity
+
+        self._return_mean, self._return_m2 = _merge(
+            self.count, self._return_mean, self._return_m2, returns
+        )
+        self._length_mean, self._length_m2 = _merge(
+            self.count, self._length_mean, self._length_m2, lengths.astype(np.float64)
+        )
+        self.count += n
+
+    @property
+    def mean_return(self) -> float:
+        return self._return_mean if self.count else float("nan")
+
+    @property
+    def var_return(self) -> float:
+        """Sample variance of returns over all episodes."""
+        return self._return_m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std_return(self) -> float:
+        return float(np.sqrt(self.var_return))
+
+    @property
+    def mean_length(self) -> float:
+        return self._length_mean if self.count else float("nan")
+
+    @property
+    def var_length(self) -> float:
+        return self._length_m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of the last `window` episodes that reached the goal."""
+        seen = min(self.count, self.window)
+        return self._window_successes / seen if seen else float("nan")
+
+    def returns(self) -> np.ndarray:
+        """Retained episode returns, oldest first (copy)."""
+        return self._ordered(self._returns)
+
+    def lengths(self) -> np.ndarray:
+        """Retained episode lengths, oldest first (copy)."""
+        return self._ordered(self._lengths)
+
+    def successes(self) -> np.ndarray:
+        """Retained goal-success flags, oldest first (copy)."""
+        return self._ordered(self._success)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Bulk export of the retained episodes."""
+        return {"returns": self.returns(), "lengths": self.lengths(), "success": self.successes()}
+
+    def _ordered(self, buffer: np.ndarray) -> np.ndarray:
+        if self.count < self.capacity:
+            return buffer[:self.count].copy()
+        return np.roll(buffer, -self._next)
+
+
+def _merge(count: int, mean: float, m2: float, values: np.ndarray) -> tuple[float, float]:
+    """Chan et al.'s parallel merge of (count, mean, M2) with a batch of values."""
+    n = values.size
+    batch_mean = float(values.mean())
+    batch_m2 = float(((values - batch_mean) ** 2).sum())
+    total = count + n
+    delta = batch_mean - mean
+    return mean + delta * n / total, m2 + batch_m2 + delta**2 * count * n / total
@@ -0,0 +1,103 @@
+"""
+Obstacle Layouts for SimpleSocialGridWorld
+
+Conceptual Framework:
+    Walls are a boolean occupancy array indexed [y, x] (True = blocked). The
+    environment turns the array into per-cell movement tables once, so
+    obstacles add no per-step cost.
+
+File Format:
+    A layout is a plain .npy file holding a (size, size) bool array. Loading
+    with mmap=True maps the file read-only, so any number of workers reading
+    the same layout share one copy of the pages through the OS cache.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+# Characters accepted as blocked cells by layout_from_ascii
+_WALL_CHARS = frozenset("#X")
+
+
+def save_layout(path: str | Path, walls: np.ndarray) -> Path:
+    """
+    Write an occupancy array to a .npy layout file.
+
+    Args:
+        path: Destination (".npy" is appended by numpy if missing)
+        walls: Square boolean array indexed [y, x]
+
+    Returns:
+        Path of the written file
+    """
+    walls = _validate(np.asarray(walls))
+    path = Path(path)
+    if path.suffix != ".npy":
+        path = path.with_name(path.name + ".npy")
+    np.save(path, walls.astype(bool))
+    return path
+
+
+def load_layout(path: str | Path, mmap: bool = True) -> np.ndarray:
+    """
+    Read a layout file written by save_layout.
+
+    Args:
+        path: Layout file
+        mmap: Memory-map the file read-only instead of reading it into memory
+
+    Returns:
+        (size, size) bool array (a read-only np.memmap when mmap is True)
+    """
+    walls = np.load(path, mmap_mode="r" if mmap else None)
+    if walls.dtype != np.bool_:
+        raise ValueError(f"Layout must be a bool array, got {walls.dtype}")
+    return _validate(walls)
+
+
+def layout_from_ascii(rows: Iterable[str]) -> np.ndarray:
+    """
+    Build an occupancy array from text rows ('#' or 'X' = wall, else free).
+
+    Example:
+        layout_from_ascii(["..#..", "..#..", ".....", ".....", "....."])
+    """
+    grid = [list(row) for row in rows]
+    walls = np.array([[char in _WALL_CHARS for char in row] for row in grid], dtype=bool)
+    return _validate(walls)
+
+
+def layout_digest(walls: np.ndarray) -> str:
+    """Stable content hash of a layout (for cache keys)."""
+    packed = np.packbits(np.asarray(walls, dtype=bool), axis=None)
+    return hashlib.sha1(repr(walls.shape).encode() + packed.tobytes()).hexdigest()[:16]
+
+
+def validate_walls(
+    walls: np.ndarray, size: int, occupied: Iterable[tuple[int, int]]
+) -> None:
+    """
+    Check a layout against an environment's grid (shared by both constructors).
+
+    Args:
+        walls: Occupancy array indexed [y, x]
+        size: Grid dimensions the layout must match
+        occupied: (x, y) positions of goals and NPCs, none of which may be walled
+
+    Raises:
+        ValueError: On a shape mismatch or a goal/NPC placed on a wall
+    """
+    if walls.shape != (size, size):
+        raise ValueError(f"walls must have shape ({size}, {size}), got {walls.shape}")
+    for x, y in occupied:
+        if walls[y, x]:
+            raise ValueError(f"Goal and NPCs cannot be placed on a wall: {(int(x), int(y))}")
+
+
+def _validate(walls: np.ndarray) -> np.ndarray:
+    if walls.ndim != 2 or walls.shape[0] != walls.shape[1]:
+        raise ValueError(f"Layout must be a square 2-D array, got shape {walls.shape}")
+    return walls
@@ -18,15 +18,26 @@ Methodological Design Decisions:
     4. Multiple reward sources create genuine domain conflict
 """
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import NamedTuple
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import NamedTuple, cast
 
 import numpy as np
 
+from .distance_fields import DistanceFields, get_distance_fields, layout_key
+from .episode_stats import EpisodeStats
+from .layout import validate_walls
+from .seeding import STREAM_MOOD, STREAM_START, SeedLike, counter_integers, lane_key
 
-class Action(Enum):
-    """Available actions in the environment."""
+
+class Action(IntEnum):
+    """
+    Available actions in the environment.
+
+    IntEnum so members are plain ints: the hot path (step_fast, tables,
+    vector env) takes bare ints or uint8 arrays, and Action remains the
+    readable user-facing name for them.
+    """
     UP = 0
     DOWN = 1
     LEFT = 2
@@ -34,21 +45,54 @@ class Action(Enum):
     INTERACT = 4  # Query/approach NPC
 
 
-class NPCMood(Enum):
-    """NPC emotional states with distinct interaction outcomes."""
+class NPCMood(IntEnum):
+    """
+    NPC emotional states with distinct interaction outcomes.
+
+    Stored as small ints (int8 arrays, GridStateCodec codes) internally;
+    members compare equal to those ints.
+    """
     FRIENDLY = 0  # Positive interaction reward
     NEUTRAL = 1   # No reward, no penalty
     HOSTILE = 2   # Strong negative penalty
 
 
-@dataclass
-class GridState:
-    """Complete environment state representation.
+# Agent's mood belief takes one of len(NPCMood) values or "unknown" (None)
+N_MOOD_ESTIMATES = len(NPCMood) + 1
 
-    Conceptual Separation:
-        - agent_pos, goal_pos: State domain (navigation)
-        - npc_mood_estimate, interaction_count: Agent domain (social)
+# Member lookup by value (avoids Enum call overhead on the hot path)
+_ACTIONS = tuple(Action)
+_MOODS = tuple(NPCMood)
+_N_ACTIONS = len(_ACTIONS)
+_INTERACT = Action.INTERACT.value
+_HOSTILE = NPCMood.HOSTILE.value
+_FRIENDLY = NPCMood.FRIENDLY.value
+
+
+def validate_actions(actions: np.ndarray, n_lanes: int) -> np.ndarray:
+    """
+    Check a batch of action codes (vector and async envs).
+
+    Negative codes would silently wrap around in table lookups (-1 indexes
+    the INTERACT column), so every code must lie in [0, len(Action)).
     """
+    actions = np.asarray(actions)
+    if actions.shape != (n_lanes,):
+        raise ValueError(f"Expected actions of shape ({n_lanes},), got {actions.shape}")
+    if actions.size and (actions.min() < 0 or actions.max() >= _N_ACTIONS):
+        raise ValueError(f"Action codes must be in [0, {_N_ACTIONS}), got {actions}")
+    return actions
+
+
+def _mood_member(code: int) -> NPCMood:
+    """NPCMood for an int code; plain _MOODS[code] would wrap -1 to HOSTILE."""
+    code = int(code)
+    if not 0 <= code < len(_MOODS):
+        raise ValueError(f"Mood code must be in [0, {len(_MOODS)}), got {code}")
+    return _MOODS[code]
+
+
+class _GridStateFields(NamedTuple):
     agent_pos: tuple[int, int]
     goal_pos: tuple[int, int]
     npc_pos: tuple[int, int]
@@ -58,6 +102,385 @@ class GridState:
     steps: int
 
 
+class GridState(_GridStateFields):
+    """Complete environment state representation.
+
+    Conceptual Separation:
+        - agent_pos, goal_pos: State domain (navigation)
+        - npc_mood_estimate, interaction_count: Agent domain (social)
+
+    Multi-NPC Note:
+        npc_pos and npc_mood_actual describe the primary NPC (index 0);
+        npc_mood_estimate is the mood of the NPC last interacted with.
+
+    Flyweight Design:
+        An immutable tuple with named fields: construction is one tuple
+        allocation, equality and hashing are by value, so states key dicts
+        (e.g. tabular Q-values) directly. Nearly every state step() creates
+        is new (steps is a field), so states are not interned on creation;
+        intern() returns a canonical shared instance for long-lived
+        collections. Use replace() (or SimpleSocialGridWorld.set_state in
+        tests) to derive modified states.
+    """
+
+    __slots__ = ()
+
+    # Canonical instances handed out by intern() (see clear_interned)
+    _interned: "dict[GridState, GridState]" = {}
+
+    def __new__(
+        cls,
+        agent_pos: tuple[int, int],
+        goal_pos: tuple[int, int],
+        npc_pos: tuple[int, int],
+        npc_mood_actual: NPCMood | int,
+        npc_mood_estimate: NPCMood | int | None,
+        interaction_count: int,
+        steps: int,
+    ) -> "GridState":
+        # Normalize only what needs it; the environment passes members and tuples
+        if npc_mood_actual.__class__ is not NPCMood:
+            npc_mood_actual = _mood_member(npc_mood_actual)
+        if npc_mood_estimate is not None and npc_mood_estimate.__class__ is not NPCMood:
+            # -1 is the "unknown" code of the codec, snapshots and vector lanes
+            npc_mood_estimate = (
+                None if npc_mood_estimate == -1 else _mood_member(npc_mood_estimate)
+            )
+        if agent_pos.__class__ is not tuple:
+            agent_pos = cast("tuple[int, int]", tuple(agent_pos))
+        if goal_pos.__class__ is not tuple:
+            goal_pos = cast("tuple[int, int]", tuple(goal_pos))
+        if npc_pos.__class__ is not tuple:
+            npc_pos = cast("tuple[int, int]", tuple(npc_pos))
+        return tuple.__new__(
+            cls,
+            (agent_pos, goal_pos, npc_pos, npc_mood_actual, npc_mood_estimate,
+             interaction_count, steps),
+        )
+
+    def replace(self, **changes: object) -> "GridState":
+        """State with the given fields changed."""
+        unknown = changes.keys() - set(self._fields)
+        if unknown:
+            raise TypeError(f"Unknown GridState fields: {sorted(unknown)}")
+        return GridState(**{**self._asdict(), **changes})
+
+    def intern(self) -> "GridState":
+        """Canonical instance equal to this state (shared by all equal states)."""
+        return GridState._interned.setdefault(self, self)
+
+    @staticmethod
+    def clear_interned() -> None:
+        """Drop the intern table (interned states stay valid, just unshared)."""
+        GridState._interned.clear()
+
+
+# Raw constructor for pre-normalized fields (field order of _GridStateFields)
+_new_state = tuple.__new__
+
+
+class MovementTables(NamedTuple):
+    """
+    Precomputed grid dynamics indexed by [cell, action].
+
+    Cells are flat positions (y * size + x); actions are Action values.
+    Built once per layout so stepping is array indexing, not branching.
+    """
+    next_cell: np.ndarray  # int32: cell after action (stays put on wall hit)
+    wall_hit: np.ndarray  # bool: movement would leave the grid or enter an obstacle
+    npc_contact: np.ndarray  # bool: INTERACT from a cell adjacent to an NPC
+    adjacent_npc: np.ndarray  # int32 (cells,): index of adjacent NPC, -1 if none
+    valid_actions: np.ndarray  # bool: moves that don't hit walls, INTERACT only next to an NPC
+
+
+# Position delta (dx, dy) per Action value
+_ACTION_DELTAS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)], dtype=np.int64)
+
+
+def build_movement_tables(
+    size: int,
+    npc_positions: Sequence[tuple[int, int]],
+    walls: np.ndarray | None = None,
+) -> MovementTables:
+    """
+    Build (cells, actions) lookup tables for a size x size grid.
+
+    Args:
+        size: Grid dimensions (size x size)
+        npc_positions: NPC locations used for adjacency (Manhattan distance = 1).
+            A cell next to several NPCs interacts with the lowest index.
+        walls: Optional boolean occupancy array (size, size) indexed [y, x];
+            moving into an occupied cell counts as a wall collision
+
+    Implementation Note:
+        Adjacency is an occupancy map over cells, filled from each NPC's four
+        neighbours, so building is O(cells + NPCs) and lookup is O(1).
+    """
+    cells = np.arange(size * size, dtype=np.int64)
+    x = cells % size
+    y = cells // size
+
+    new_x = x[:, None] + _ACTION_DELTAS[:, 0]
+    new_y = y[:, None] + _ACTION_DELTAS[:, 1]
+    in_bounds = (new_x >= 0) & (new_x < size) & (new_y >= 0) & (new_y < size)
+    target = np.where(in_bounds, new_y * size + new_x, cells[:, None])
+
+    passable = in_bounds
+    if walls is not None:
+        passable = in_bounds & ~np.asarray(walls, dtype=bool).ravel()[target]
+
+    next_cell = np.where(passable, target, cells[:, None]).astype(np.int32)
+
+    npcs = np.asarray(npc_positions, dtype=np.int64).reshape(-1, 2)
+    n_npcs = len(npcs)
+    neighbour_x = npcs[:, 0:1] + _ACTION_DELTAS[:4, 0]
+    neighbour_y = npcs[:, 1:2] + _ACTION_DELTAS[:4, 1]
+    inside = (neighbour_x >= 0) & (neighbour_x < size) & (neighbour_y >= 0) & (neighbour_y < size)
+    npc_ids = np.broadcast_to(np.arange(n_npcs)[:, None], inside.shape)
+
+    adjacent_npc = np.full(cells.size, n_npcs, dtype=np.int32)
+    np.minimum.at(adjacent_npc, (neighbour_y * size + neighbour_x)[inside], npc_ids[inside])
+    adjacent_npc[adjacent_npc == n_npcs] = -1
+
+    npc_contact = np.zeros((cells.size, len(Action)), dtype=bool)
+    npc_contact[:, Action.INTERACT.value] = adjacent_npc >= 0
+
+    valid_actions = passable.copy()
+    valid_actions[:, Action.INTERACT.value] = adjacent_npc >= 0
+
+    return MovementTables(
+        next_cell=next_cell,
+        wall_hit=~passable,
+        npc_contact=npc_contact,
+        adjacent_npc=adjacent_npc,
+        valid_actions=valid_actions,
+    )
+
+
+class KernelStep(NamedTuple):
+    """Outcome of step_kernel for a batch of lanes (timeout not included)."""
+    next_cell: np.ndarray  # int (N,)
+    reward: np.ndarray  # float64 (N,)
+    state_reward: np.ndarray  # float64 (N,) navigation share of reward
+    agent_reward: np.ndarray  # float64 (N,) social share of reward
+    terminal: np.ndarray  # bool (N,) goal reached or third hostile interaction
+    state_error: np.ndarray  # float64 (N,)
+    agent_error: np.ndarray  # float64 (N,)
+    goal_reached: np.ndarray  # bool (N,)
+    contact: np.ndarray  # bool (N,) interacted with the NPC (mood revealed)
+    interaction_counts: np.ndarray  # int32 (N,) counts after this step
+
+
+def step_kernel(
+    tables: MovementTables,
+    goal_cell: int,
+    cells: np.ndarray,
+    actions: np.ndarray,
+    moods: np.ndarray,
+    interaction_counts: np.ndarray,
+) -> KernelStep:
+    """
+    Pure batched transition of the single-NPC dynamics.
+
+    Shared by VectorSocialGridWorld.step, SimpleSocialGridWorld.rollout and
+    trajectory replay so all run exactly the same arithmetic. Inputs are not
+    modified.
+
+    Reward Logic:
+        Same ordering as SimpleSocialGridWorld.step: step cost, interaction
+        or movement outcome, goal bonus (timeouts are left to the caller).
+    """
+    n = cells.shape[0]
+    reward = np.full(n, -0.1)  # Always apply step cost
+    state_error = np.zeros(n)
+    agent_error = np.zeros(n)
+    agent_reward = np.zeros(n)
+
+    # Table lookups replace per-lane branching
+    new_cell = tables.next_cell[cells, actions]
+    wall = tables.wall_hit[cells, actions]
+    social = tables.npc_contact[cells, actions]
+    wasted = (actions == Action.INTERACT.value) & ~social
+
+    # Agent domain: Social interaction
+    hostile = social & (moods == NPCMood.HOSTILE.value)
+    friendly = social & (moods == NPCMood.FRIENDLY.value)
+    reward[hostile] -= 5.0
+    agent_error[hostile] = 5.0
+    reward[friendly] += 1.0
+    agent_reward[hostile] = -5.0
+    agent_reward[friendly] = 1.0
+
+    counts = interaction_counts + social
+    terminal = hostile & (counts >= 3)
+
+    reward[wasted] -= 0.5
+    state_error[wasted] = 0.5
+
+    # State domain: Navigation actions
+    reward[wall] -= 1.0
+    state_error[wall] = 1.0
+
+    # Check goal reached
+    goal = (cells == goal_cell) | (new_cell == goal_cell)
+    reward[goal] += 10.0
+    terminal |= goal
+
+    state_reward = -0.1 - 0.5 * wasted - 1.0 * wall + 10.0 * goal
+
+    return KernelStep(
+        next_cell=new_cell,
+        reward=reward,
+        state_reward=state_reward,
+        agent_reward=agent_reward,
+        terminal=terminal,
+        state_error=state_error,
+        agent_error=agent_error,
+        goal_reached=goal,
+        contact=social,
+        interaction_counts=counts.astype(np.int32),
+    )
+
+
+class RolloutResult(NamedTuple):
+    """Per-episode outcome of SimpleSocialGridWorld.rollout."""
+    returns: np.ndarray  # float64 (E,)
+    lengths: np.ndarray  # int32 (E,)
+    success: np.ndarray  # bool (E,): episode ended at the goal
+    start_cells: np.ndarray  # int64 (E,)
+    moods: np.ndarray  # int8 (E,): actual NPC mood during the episode
+
+
+class ExhaustiveEvaluation(NamedTuple):
+    """
+    Outcome of SimpleSocialGridWorld.evaluate_all_starts.
+
+    Arrays are indexed (mood, start cell) with cells ordered as start_cells.
+    """
+    returns: np.ndarray  # float64 (M, C)
+    lengths: np.ndarray  # int32 (M, C)
+    success: np.ndarray  # bool (M, C)
+    weights: np.ndarray  # float64 (M, C): start-distribution probability, sums to 1
+    start_cells: np.ndarray  # int32 (C,)
+    mean_return: float
+    mean_length: float
+    success_rate: float
+    mood_returns: np.ndarray  # float64 (M,): mean return per mood
+
+
+class EnvSnapshot(NamedTuple):
+    """
+    Minimal fixed-size record of SimpleSocialGridWorld dynamics state.
+
+    Random state is fully described by (seed_key, episode_count) because
+    draws come from counter-based streams (see seeding.py).
+    """
+    agent_cell: int
+    npc_moods: tuple[int, ...]  # NPCMood value per NPC in the current episode
+    current_moods: tuple[int, ...]  # NPCMood value per NPC for the next episode
+    mood_estimate: int  # -1 = unknown
+    interaction_count: int
+    steps: int
+    episode_count: int
+    seed_key: int
+    initialized: bool
+    episode_return: float = 0.0  # Reward accumulated in the current episode
+
+
+def build_start_cells(
+    size: int,
+    excluded: Sequence[tuple[int, int]],
+    walls: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Flat cells an episode may start in (every free cell except the excluded ones).
+
+    Sampling an index into this array replaces rejection sampling.
+    """
+    permitted = np.ones(size * size, dtype=bool)
+    if walls is not None:
+        permitted &= ~np.asarray(walls, dtype=bool).ravel()
+    for x, y in excluded:
+        permitted[y * size + x] = False
+    return np.flatnonzero(permitted).astype(np.int32)
+
+
+def generate_mood_schedule(
+    seed_key: int,
+    n_episodes: int,
+    mood_change_frequency: int,
+    initial_moods: Sequence[int] | np.ndarray = (NPCMood.NEUTRAL.value,),
+    first_episode: int = 1,
+) -> np.ndarray:
+    """
+    Moods of episodes first_episode .. first_episode + n_episodes - 1.
+
+    Reproduces the draws reset() makes live: at every episode that is a
+    multiple of mood_change_frequency each NPC moves by an offset in
+    [1, len(NPCMood)) drawn from STREAM_MOOD. Offsets are drawn for all
+    change episodes at once and accumulated with a cumulative sum.
+
+    Args:
+        seed_key: Stream key (see seeding.lane_key)
+        n_episodes: Number of episodes to schedule
+        mood_change_frequency: Episodes between NPC mood changes
+        initial_moods: Mood value per NPC before first_episode
+        first_episode: Episode number (episode_count after reset) of row 0
+
+    Returns:
+        int8 array (n_episodes, n_npcs) of NPCMood values
+    """
+    initial = np.atleast_1d(np.asarray(initial_moods, dtype=np.int64))
+    episodes = first_episode + np.arange(n_episodes, dtype=np.int64)
+    changes = np.flatnonzero(episodes % mood_change_frequency == 0)
+
+    offsets = np.zeros((n_episodes, initial.size), dtype=np.int64)
+    offsets[changes] = 1 + counter_integers(
+        seed_key,
+        episodes[changes, None],
+        STREAM_MOOD,
+        len(NPCMood) - 1,
+        np.arange(initial.size)[None, :],
+    )
+    return ((initial + np.cumsum(offsets, axis=0)) % len(NPCMood)).astype(np.int8)
+
+
+def mood_change_episodes(
+    schedule: np.ndarray,
+    initial_moods: Sequence[int] | np.ndarray = (NPCMood.NEUTRAL.value,),
+) -> np.ndarray:
+    """
+    Episode numbers (1-based, like episode_count) at which any NPC's mood
+    differs from the previous episode.
+
+    Args:
+        schedule: Mood schedule (n_episodes,) or (n_episodes, n_npcs); for a
+            lane-major VectorSocialGridWorld schedule pass one lane's row
+            (or use VectorSocialGridWorld.mood_change_episodes(lane))
+        initial_moods: Moods before the first scheduled episode
+    """
+    schedule = np.asarray(schedule)
+    if schedule.ndim == 1:
+        schedule = schedule[:, None]
+    previous = np.vstack([np.broadcast_to(initial_moods, schedule.shape[1:]), schedule[:-1]])
+    return np.flatnonzero((schedule != previous).any(axis=1)) + 1
+
+
+class RewardChannels(NamedTuple):
+    """
+    Per-domain decomposition of one step's feedback.
+
+    state_reward + agent_reward equals the step reward (up to float
+    rounding; the reward itself is authoritative). Errors are the
+    magnitudes of the domain's mistakes, consumed by the State and Agent
+    modules as their own learning signals.
+    """
+    state_reward: float  # Navigation: step cost, wall, wasted interaction, goal
+    agent_reward: float  # Social: hostile or friendly interaction
+    state_error: float  # Navigation mistakes
+    agent_error: float  # Social assessment mistakes
+
+
 class Transition(NamedTuple):
     """Experience tuple for learning."""
     state: GridState
@@ -65,7 +488,15 @@ class Transition(NamedTuple):
     reward: float
     next_state: GridState
     done: bool
-    info: dict[str, float]
+    channels: RewardChannels
+
+    @property
+    def info(self) -> dict[str, float]:
+        """Error channels as a dict (compatibility view of channels)."""
+        return {
+            "state_error": self.channels.state_error,
+            "agent_error": self.channels.agent_error,
+        }
 
 
 class SimpleSocialGridWorld:
@@ -93,6 +524,23 @@ class SimpleSocialGridWorld:
         NPC positioned at (2,2) in 5x5 grid ensures agent must either:
         A) Navigate around NPC (longer path, more step cost)
         B) Assess mood and interact strategically (requires Agent domain)
+
+    Large-Grid Mode:
+        npc_positions places K NPCs, each with its own mood (npc_moods).
+        Adjacency and movement come from precomputed per-cell tables, so
+        step cost is O(1) in grid size and NPC count (tested to 1000x1000).
+
+    Obstacle Layouts:
+        walls is a boolean occupancy array (see layout.py for the file
+        format). Entering an obstacle is a wall collision; valid_actions
+        exposes the per-cell mask of non-colliding moves to agents.
+
+    Mood Schedules:
+        Without a schedule, moods change live in reset(). A schedule fixes
+        the mood of every episode up front (row k-1 serves episode k), either
+        given explicitly or from precompute_mood_schedule(), which yields the
+        same moods the live draws would. mood_change_episodes then lists the
+        adaptation points without scanning logs.
     """
 
     def __init__(
@@ -102,7 +550,11 @@ class SimpleSocialGridWorld:
         goal_position: tuple[int, int] = (4, 4),
         mood_change_frequency: int = 75,
         max_steps: int = 50,
-        seed: int | None = None,
+        seed: SeedLike = None,
+        npc_positions: Sequence[tuple[int, int]] | None = None,
+        walls: np.ndarray | None = None,
+        mood_schedule: np.ndarray | None = None,
+        stats_capacity: int = 10_000,
     ):
         """
         Initialize environment with configurable parameters.
@@ -113,25 +565,221 @@ class SimpleSocialGridWorld:
             goal_position: Fixed goal location
             mood_change_frequency: Episodes between NPC mood changes
             max_steps: Maximum steps per episode before timeout
-            seed: Random seed for reproducibility
+            seed: Random seed for reproducibility (int or SeedSequence, e.g.
+                a spawned child for one lane of a batched run)
+            npc_positions: Locations of K NPCs (overrides npc_position);
+                the first one is the primary NPC reported in GridState
+            walls: Boolean occupancy array (size, size) indexed [y, x]; kept
+                by reference, so a memory-mapped layout is shared, not copied
+            mood_schedule: Mood per episode, shape (n_episodes,) or
+                (n_episodes, n_npcs); replaces live mood changes
+            stats_capacity: Finished episodes retained by episode_stats
         """
+        if npc_positions is None:
+            npc_positions = [npc_position]
+        if len(npc_positions) == 0:
+            raise ValueError("At least one NPC is required")
+        if walls is not None:
+            validate_walls(walls, size, [goal_position, *npc_positions])
+
         self.size = size
-        self.npc_pos = npc_position
+        self.npc_positions = [(int(x), int(y)) for x, y in npc_positions]
+        self.npc_pos = self.npc_positions[0]
         self.goal_pos = goal_position
+        self._goal_pos = tuple(goal_position)  # As stored in GridState
+        self.walls = walls
         self.mood_change_freq = mood_change_frequency
         self.max_steps = max_steps
 
-        self.rng = np.random.default_rng(seed)
+        # Counter-based random streams: draws depend only on (seed, episode),
+        # never on how many draws came before (see seeding.py)
+        self.seed_key = lane_key(seed)
 
-        # Episode tracking for mood changes
+        # Grid dynamics lookup tables (built once per layout)
+        self.tables = build_movement_tables(size, self.npc_positions, walls)
+        self._goal_cell = goal_position[1] * size + goal_position[0]
+        self.start_cells = build_start_cells(size, [goal_position, *self.npc_positions], walls)
+        self._distance_fields: DistanceFields | None = None  # Built on first use
+
+        # Episode tracking for mood changes (one mood per NPC)
         self.episode_count = 0
-        self.current_mood = NPCMood.NEUTRAL
+        self.npc_moods = np.full(len(self.npc_positions), NPCMood.NEUTRAL.value, dtype=np.int8)
+
+        self.mood_schedule: np.ndarray | None = None
+        if mood_schedule is not None:
+            self.set_mood_schedule(mood_schedule)
+
+        # Current state as scalar fields (updated in place by step_fast)
+        self._initialized = False
+        self._cell = 0
+        self._moods = self.npc_moods.tolist()  # Moods fixed for the current episode
+        self._estimate = -1  # -1 = mood unknown
+        self._interactions = 0
+        self._steps = 0
+        self._return = 0.0  # Reward accumulated in the current episode
+        self._state: GridState | None = None  # Lazily built GridState view
 
-        # Current state
-        self.state: GridState | None = None
+        # Domain reward and error channels of the most recent step
+        self.last_state_reward = 0.0
+        self.last_agent_reward = 0.0
+        self.last_state_error = 0.0
+        self.last_agent_error = 0.0
 
-        # Performance tracking
-        self.total_rewards: list[float] = []
+        # Performance tracking (bounded: ring buffer plus running summaries)
+        self.episode_stats = EpisodeStats(stats_capacity, window=min(100, stats_capacity))
+
+    @property
+    def current_mood(self) -> NPCMood:
+        """Mood of the primary NPC carried into the next episode."""
+        return _MOODS[self.npc_moods[0]]
+
+    @current_mood.setter
+    def current_mood(self, mood: NPCMood | int) -> None:
+        self.npc_moods[0] = _mood_member(mood)
+
+    def set_mood_schedule(self, schedule: np.ndarray | None) -> None:
+        """
+        Serve NPC moods from a per-episode schedule (None restores live changes).
+
+        Args:
+            schedule: NPCMood values, shape (n_episodes,) or (n_episodes, n_npcs);
+                row k-1 is used by episode k
+        """
+        if schedule is None:
+            self.mood_schedule = None
+            return
+        schedule = np.asarray(schedule, dtype=np.int8)
+        if schedule.ndim == 1:
+            schedule = schedule[:, None]
+        if schedule.ndim != 2 or schedule.shape[1] != self.npc_moods.size:
+            raise ValueError(
+                f"mood_schedule must have shape (n_episodes, {self.npc_moods.size}), "
+                f"got {schedule.shape}"
+            )
+        if schedule.size and (schedule.min() < 0 or schedule.max() >= len(NPCMood)):
+            raise ValueError("mood_schedule contains values outside NPCMood")
+        self.mood_schedule = schedule
+
+    def precompute_mood_schedule(self, n_episodes: int) -> np.ndarray:
+        """
+        Generate and install the schedule for episodes 1..n_episodes.
+
+        The moods equal those the live per-reset draws would produce, so
+        installing the schedule does not change the run.
+        """
+        schedule = generate_mood_schedule(
+            self.seed_key,
+            n_episodes,
+            self.mood_change_freq,
+            np.full(self.npc_moods.size, NPCMood.NEUTRAL.value),
+        )
+        self.set_mood_schedule(schedule)
+        return schedule
+
+    @property
+    def mood_change_episodes(self) -> np.ndarray:
+        """Episodes at which some NPC's mood changes (requires a schedule)."""
+        if self.mood_schedule is None:
+            raise RuntimeError("No mood schedule installed; see precompute_mood_schedule()")
+        return mood_change_episodes(
+            self.mood_schedule, np.full(self.npc_moods.size, NPCMood.NEUTRAL.value)
+        )
+
+    def _episode_moods(self, first_episode: int, n_episodes: int) -> np.ndarray:
+        """Moods (n_episodes, n_npcs) of upcoming episodes, scheduled or live-equivalent."""
+        if self.mood_schedule is None:
+            return generate_mood_schedule(
+                self.seed_key, n_episodes, self.mood_change_freq, self.npc_moods, first_episode
+            )
+        stop = first_episode - 1 + n_episodes
+        if stop > len(self.mood_schedule):
+            raise RuntimeError(
+                f"Mood schedule covers {len(self.mood_schedule)} episodes, episode {stop} requested"
+            )
+        return self.mood_schedule[first_episode - 1:stop]
+
+    @property
+    def state(self) -> GridState | None:
+        """
+        Current state as a GridState (None before the first reset).
+
+        Built lazily from the scalar fields and cached until the next step.
+        """
+        if not self._initialized:
+            return None
+        return self._current_state()
+
+    @state.setter
+    def state(self, state: GridState) -> None:
+        """Load scalar fields from a GridState."""
+        x, y = state.agent_pos
+        estimate = state.npc_mood_estimate
+        self._cell = y * self.size + x
+        self._moods[0] = state.npc_mood_actual.value
+        self._estimate = -1 if estimate is None else estimate.value
+        self._interactions = state.interaction_count
+        self._steps = state.steps
+        self._state = state
+        self._initialized = True
+
+    def _current_state(self) -> GridState:
+        """GridState view of the scalar fields (callers ensure reset() ran)."""
+        if self._state is None:
+            # Fields are already normalized, so skip GridState.__new__'s checks
+            y, x = divmod(self._cell, self.size)
+            self._state = _new_state(GridState, (
+                (x, y),
+                self._goal_pos,
+                self.npc_pos,
+                _MOODS[self._moods[0]],
+                None if self._estimate < 0 else _MOODS[self._estimate],
+                self._interactions,
+                self._steps,
+            ))
+        return self._state
+
+    def set_state(self, **changes: object) -> GridState:
+        """
+        Overwrite fields of the current state (test and debugging helper).
+
+        Example:
+            env.set_state(agent_pos=(2, 1), npc_mood_actual=NPCMood.HOSTILE)
+
+        Returns:
+            The new current GridState
+        """
+        if self.state is None:
+            raise RuntimeError("Must call reset() before set_state()")
+        self.state = self.state.replace(**changes)
+        return self.state
+
+    @property
+    def valid_actions(self) -> np.ndarray:
+        """
+        Per-cell action mask (cells, actions): True where the action neither
+        collides with a wall nor interacts away from an NPC.
+        """
+        return self.tables.valid_actions
+
+    def action_mask(self) -> np.ndarray:
+        """Valid-action mask for the agent's current cell."""
+        return self.tables.valid_actions[self._cell]
+
+    @property
+    def distance_fields(self) -> DistanceFields:
+        """
+        BFS distances (per cell) to the goal and to the NPC neighbourhood,
+        computed once per layout and shared by environments with that layout.
+        """
+        if self._distance_fields is None:
+            key = layout_key(self.size, self.goal_pos, self.npc_positions, self.walls)
+            self._distance_fields = get_distance_fields(key, self.tables, self._goal_cell)
+        return self._distance_fields
+
+    @property
+    def state_index(self) -> int:
+        """Current agent-observable state as a GridStateCodec index."""
+        return self._cell * N_MOOD_ESTIMATES + self._estimate + 1
 
     def reset(self) -> GridState:
         """
@@ -141,34 +789,40 @@ class SimpleSocialGridWorld:
             Agent starts at random position (not goal or NPC) to vary
             initial conditions across episodes.
         """
+        self.reset_fast()
+        return self._current_state()
+
+    def reset_fast(self) -> int:
+        """
+        Reset environment without building a GridState.
+
+        Returns:
+            Initial state as a GridStateCodec index
+        """
         self.episode_count += 1
 
         # Update NPC mood periodically (per Ty's suggestion: ~75 episodes)
-        if self.episode_count % self.mood_change_freq == 0:
+        if self.mood_schedule is not None:
+            self.npc_moods[:] = self._episode_moods(self.episode_count, 1)[0]
+        elif self.episode_count % self.mood_change_freq == 0:
             self._update_npc_mood()
 
-        # Random agent starting position (avoid goal and NPC)
-        while True:
-            agent_pos = (
-                int(self.rng.integers(0, self.size)),
-                int(self.rng.integers(0, self.size))
-            )
-            if agent_pos != self.goal_pos and agent_pos != self.npc_pos:
-                break
-
-        self.state = GridState(
-            agent_pos=agent_pos,
-            goal_pos=self.goal_pos,
-            npc_pos=self.npc_pos,
-            npc_mood_actual=self.current_mood,
-            npc_mood_estimate=None,  # Agent doesn't know mood initially
-            interaction_count=0,
-            steps=0,
+        # Random agent starting cell (never goal or NPC), episode-keyed stream
+        pick = counter_integers(
+            self.seed_key, self.episode_count, STREAM_START, self.start_cells.size
         )
+        self._cell = self.start_cells.item(pick[0])
+        self._moods = self.npc_moods.tolist()
+        self._estimate = -1  # Agent doesn't know mood initially
+        self._interactions = 0
+        self._steps = 0
+        self._return = 0.0
+        self._state = None
+        self._initialized = True
 
-        return self.state
+        return self.state_index
 
-    def step(self, action: Action) -> Transition:
+    def step(self, action: Action | int) -> Transition:
         """
         Execute action and return transition.
 
@@ -182,162 +836,343 @@ class SimpleSocialGridWorld:
         Domain-Specific Feedback:
             State domain errors: wall collision, inefficient path
             Agent domain errors: hostile interaction, mood misestimation
+
+        Compatibility Note:
+            Thin wrapper over step_fast() that builds GridState and Transition
+            objects for callers that need them.
         """
-        if self.state is None:
+        state = self.state
+        if state is None:
             raise RuntimeError("Must call reset() before step()")
 
-        reward = 0.0
-        done = False
-        info: dict[str, float] = {
-            "state_error": 0.0,  # Navigation mistakes
-            "agent_error": 0.0,  # Social assessment mistakes
-        }
+        code = int(action)
+        _, reward, done = self.step_fast(code)
 
-        # Always apply step cost (efficiency incentive)
-        reward -= 0.1
+        return Transition(
+            state=state,
+            action=_ACTIONS[code],
+            reward=reward,
+            next_state=self._current_state(),
+            done=done,
+            channels=self.last_channels,
+        )
 
-        # Process action
-        next_pos = self.state.agent_pos
-        new_pos = self.state.agent_pos  # Initialize new_pos for all action types
+    @property
+    def last_channels(self) -> RewardChannels:
+        """Per-domain reward and error channels of the most recent step."""
+        return RewardChannels(
+            state_reward=self.last_state_reward,
+            agent_reward=self.last_agent_reward,
+            state_error=self.last_state_error,
+            agent_error=self.last_agent_error,
+        )
 
-        if action == Action.INTERACT:
-            # Agent domain: Social interaction
-            if self._is_adjacent_to_npc(self.state.agent_pos):
-                mood = self.state.npc_mood_actual
+    def step_fast(self, action: int) -> tuple[int, float, bool]:
+        """
+        Execute action by updating scalar fields in place.
 
-                # Update agent's belief about NPC mood
-                new_mood_estimate = mood
+        Same dynamics and reward logic as step(), without allocating GridState,
+        Transition or info objects. Domain channels are left in the last_*
+        attributes (see last_channels).
 
-                # Interaction rewards based on actual mood
-                if mood == NPCMood.HOSTILE:
-                    reward -= 5.0
-                    info["agent_error"] = 5.0  # Major social misjudgment
-                elif mood == NPCMood.FRIENDLY:
-                    reward += 1.0
-                elif mood == NPCMood.NEUTRAL:
-                    reward += 0.0
+        Args:
+            action: Action code 0-4 (int, NumPy integer or Action member)
+
+        Returns:
+            (next_state_index, reward, done) with GridStateCodec indexing
+        """
+        if not self._initialized:
+            raise RuntimeError("Must call reset() before step()")
+        if not 0 <= action < _N_ACTIONS:
+            raise ValueError(f"Action code must be in [0, {_N_ACTIONS}), got {action}")
+
+        tables = self.tables
+        cell = self._cell
+        new_cell = tables.next_cell.item(cell, action)
+
+        # Always apply step cost (efficiency incentive)
+        reward = -0.1
+        done = False
+        state_error = 0.0
+        agent_error = 0.0
+        state_reward = -0.1
+        agent_reward = 0.0
 
-                # Update interaction count
-                new_interaction_count = self.state.interaction_count + 1
+        if action == _INTERACT:
+            # Agent domain: Social interaction (with the adjacent NPC, if any)
+            npc = tables.adjacent_npc.item(cell)
+            if npc >= 0:
+                mood = self._moods[npc]
+                self._estimate = mood  # Update agent's belief about NPC mood
+                self._interactions += 1
+
+                if mood == _HOSTILE:
+                    reward -= 5.0
+                    agent_reward = -5.0
+                    agent_error = 5.0  # Major social misjudgment
 
-                # Severe penalty: 3 hostile interactions ends episode
-                if new_interaction_count >= 3 and mood == NPCMood.HOSTILE:
-                    done = True
+                    # Severe penalty: 3 hostile interactions ends episode
+                    if self._interactions >= 3:
+                        done = True
+                elif mood == _FRIENDLY:
+                    reward += 1.0
+                    agent_reward = 1.0
             else:
                 # Tried to interact but not adjacent
-                new_mood_estimate = self.state.npc_mood_estimate
-                new_interaction_count = self.state.interaction_count
                 reward -= 0.5  # Wasted action penalty
-                info["state_error"] = 0.5  # Navigation error (position misjudgment)
-
-        else:
-            # State domain: Navigation actions
-            dx, dy = self._action_to_delta(action)
-            new_pos = (
-                self.state.agent_pos[0] + dx,
-                self.state.agent_pos[1] + dy
-            )
+                state_reward -= 0.5
+                state_error = 0.5  # Navigation error (position misjudgment)
 
-            # Wall collision check
-            if not self._is_valid_position(new_pos):
-                reward -= 1.0
-                new_pos = self.state.agent_pos  # Stay in place
-                info["state_error"] = 1.0  # Navigation error
-
-            new_mood_estimate = self.state.npc_mood_estimate
-            new_interaction_count = self.state.interaction_count
+        elif tables.wall_hit.item(cell, action):
+            # State domain: Wall collision (next_cell keeps agent in place)
+            reward -= 1.0
+            state_reward -= 1.0
+            state_error = 1.0  # Navigation error
 
         # Check goal reached
-        if next_pos == self.goal_pos or new_pos == self.goal_pos:
+        goal = cell == self._goal_cell or new_cell == self._goal_cell
+        if goal:
             reward += 10.0
+            state_reward += 10.0
             done = True
 
         # Timeout check
-        new_steps = self.state.steps + 1
-        if new_steps >= self.max_steps:
+        self._steps += 1
+        if self._steps >= self.max_steps:
             done = True
 
-        # Create next state
-        next_state = GridState(
-            agent_pos=new_pos,
-            goal_pos=self.state.goal_pos,
-            npc_pos=self.state.npc_pos,
-            npc_mood_actual=self.state.npc_mood_actual,
-            npc_mood_estimate=new_mood_estimate,
-            interaction_count=new_interaction_count,
-            steps=new_steps,
+        self._cell = new_cell
+        self._state = None
+        self._return += reward
+        self.last_state_reward = state_reward
+        self.last_agent_reward = agent_reward
+        self.last_state_error = state_error
+        self.last_agent_error = agent_error
+
+        if done:
+            self.episode_stats.add(self._return, self._steps, goal)
+
+        return new_cell * N_MOOD_ESTIMATES + self._estimate + 1, reward, done
+
+    def rollout(self, policy_table: np.ndarray, n_episodes: int) -> RolloutResult:
+        """
+        Run a fixed tabular policy for the next n_episodes, all in lockstep.
+
+        Equivalent to n_episodes rounds of reset_fast() followed by
+        step_fast(policy_table[state]) until done: start cells and mood
+        changes come from the same counter-based streams, and episode_count
+        and npc_moods advance accordingly. Episodes are stepped together by
+        step_kernel, so the Python loop runs over time steps only
+        (at most max_steps iterations).
+
+        Args:
+            policy_table: Action per GridStateCodec state index, shape (n_states,)
+            n_episodes: Number of episodes to run
+
+        Returns:
+            RolloutResult with per-episode returns, lengths and goal success
+
+        Note:
+            The current episode is abandoned; call reset() before stepping.
+        """
+        policy_table = self._check_policy_table(policy_table)
+
+        episodes = self.episode_count + 1 + np.arange(n_episodes, dtype=np.int64)
+        moods = self._episode_moods(self.episode_count + 1, n_episodes)[:, 0]
+
+        picks = counter_integers(self.seed_key, episodes, STREAM_START, self.start_cells.size)
+        start_cells = self.start_cells[picks].astype(np.int64)
+
+        returns, lengths, success = self._run_lockstep(policy_table, start_cells, moods)
+
+        self.episode_stats.add_batch(returns, lengths, success)
+        if n_episodes:
+            self.episode_count = int(episodes[-1])
+            self.npc_moods[0] = moods[-1]
+        self._initialized = False
+        self._state = None
+
+        return RolloutResult(
+            returns=returns,
+            lengths=lengths,
+            success=success,
+            start_cells=start_cells,
+            moods=moods,
         )
 
-        transition = Transition(
-            state=self.state,
-            action=action,
-            reward=reward,
-            next_state=next_state,
-            done=done,
-            info=info,
+    def evaluate_all_starts(
+        self,
+        policy_table: np.ndarray,
+        mood_weights: np.ndarray | None = None,
+    ) -> ExhaustiveEvaluation:
+        """
+        Exact evaluation: one episode from every (mood, start cell) pair.
+
+        Episodes are deterministic given start cell and mood, so a single
+        lockstep batch of len(NPCMood) x len(start_cells) episodes yields the
+        exact expected statistics under the start distribution (uniform over
+        start cells, mood_weights over moods). Environment state, episode
+        counters and episode_stats are left untouched.
+
+        Args:
+            policy_table: Action per GridStateCodec state index, shape (n_states,)
+            mood_weights: Probability of each mood (default uniform, the
+                stationary distribution of the forced-change mood chain)
+
+        Returns:
+            ExhaustiveEvaluation with per-(mood, cell) outcomes and weighted means
+        """
+        policy_table = self._check_policy_table(policy_table)
+        n_moods, n_cells = len(NPCMood), self.start_cells.size
+
+        if mood_weights is None:
+            mood_weights = np.full(n_moods, 1.0 / n_moods)
+        mood_weights = np.asarray(mood_weights, dtype=np.float64)
+        if mood_weights.shape != (n_moods,) or not np.isclose(mood_weights.sum(), 1.0):
+            raise ValueError(f"mood_weights must be {n_moods} probabilities summing to 1")
+
+        moods = np.repeat(np.arange(n_moods, dtype=np.int8), n_cells)
+        start_cells = np.tile(self.start_cells.astype(np.int64), n_moods)
+        returns, lengths, success = self._run_lockstep(policy_table, start_cells, moods)
+
+        shape = (n_moods, n_cells)
+        weights = np.repeat(mood_weights[:, None] / n_cells, n_cells, axis=1)
+        returns, lengths, success = (a.reshape(shape) for a in (returns, lengths, success))
+        return ExhaustiveEvaluation(
+            returns=returns,
+            lengths=lengths,
+            success=success,
+            weights=weights,
+            start_cells=self.start_cells.copy(),
+            mean_return=float((weights * returns).sum()),
+            mean_length=float((weights * lengths).sum()),
+            success_rate=float((weights * success).sum()),
+            mood_returns=returns.mean(axis=1),
         )
 
-        self.state = next_state
+    def _check_policy_table(self, policy_table: np.ndarray) -> np.ndarray:
+        if len(self.npc_positions) != 1:
+            raise ValueError("Policy rollouts support single-NPC environments only")
+        policy_table = np.asarray(policy_table, dtype=np.int64)
+        n_states = self.size * self.size * N_MOOD_ESTIMATES
+        if policy_table.shape != (n_states,):
+            raise ValueError(
+                f"policy_table must have shape ({n_states},), got {policy_table.shape}"
+            )
+        return policy_table
 
-        if done:
-            self.total_rewards.append(reward)
+    def _run_lockstep(
+        self, policy_table: np.ndarray, start_cells: np.ndarray, moods: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Step one episode per lane through step_kernel until all are done.
+
+        Returns:
+            (returns, lengths, goal success) per lane
+        """
+        n = start_cells.size
+        cells = start_cells.copy()
+        estimates = np.full(n, -1, dtype=np.int64)
+        counts = np.zeros(n, dtype=np.int32)
+        returns = np.zeros(n)
+        lengths = np.zeros(n, dtype=np.int32)
+        success = np.zeros(n, dtype=bool)
+        lanes = np.arange(n)
 
-        return transition
+        for t in range(self.max_steps):
+            if lanes.size == 0:
+                break
+            obs = cells[lanes] * N_MOOD_ESTIMATES + estimates[lanes] + 1
+            kernel = step_kernel(
+                self.tables, self._goal_cell, cells[lanes], policy_table[obs],
+                moods[lanes], counts[lanes],
+            )
+            returns[lanes] += kernel.reward
+            lengths[lanes] = t + 1
+            success[lanes] = kernel.goal_reached
+
+            contact = lanes[kernel.contact]
+            estimates[contact] = moods[contact]
+            counts[lanes] = kernel.interaction_counts
+            cells[lanes] = kernel.next_cell
+            lanes = lanes[~kernel.terminal]
+
+        return returns, lengths, success
+
+    def get_snapshot(self) -> EnvSnapshot:
+        """
+        Capture the dynamics state for cheap branching (lookahead, Dyna, MCTS).
+
+        Performance tracking (episode_stats) is not part of the snapshot.
+        """
+        return EnvSnapshot(
+            agent_cell=self._cell,
+            npc_moods=tuple(self._moods),
+            current_moods=tuple(self.npc_moods.tolist()),
+            mood_estimate=self._estimate,
+            interaction_count=self._interactions,
+            steps=self._steps,
+            episode_count=self.episode_count,
+            seed_key=self.seed_key,
+            initialized=self._initialized,
+            episode_return=self._return,
+        )
+
+    def restore_snapshot(self, snapshot: EnvSnapshot) -> None:
+        """Return to a state captured by get_snapshot()."""
+        self._cell = snapshot.agent_cell
+        self._moods = list(snapshot.npc_moods)
+        self.npc_moods[:] = snapshot.current_moods
+        self._estimate = snapshot.mood_estimate
+        self._interactions = snapshot.interaction_count
+        self._steps = snapshot.steps
+        self.episode_count = snapshot.episode_count
+        self.seed_key = snapshot.seed_key
+        self._initialized = snapshot.initialized
+        self._return = snapshot.episode_return
+        self._state = None
 
     def _update_npc_mood(self) -> None:
         """
-        Change NPC mood periodically to test adaptation.
+        Change every NPC's mood periodically to test adaptation.
 
         Methodological Justification:
             Mood changes force agents to re-assess social context,
             testing whether Agent domain arousal enables faster adaptation.
         """
-        moods = list(NPCMood)
-        # Don't stay in same mood (force change)
-        moods.remove(self.current_mood)
-        mood_indices = list(range(len(moods)))
-        selected_index = self.rng.choice(mood_indices)
-        self.current_mood = moods[selected_index]
-
-    def _action_to_delta(self, action: Action) -> tuple[int, int]:
-        """Convert action enum to position delta."""
-        if action == Action.UP:
-            return (0, -1)
-        elif action == Action.DOWN:
-            return (0, 1)
-        elif action == Action.LEFT:
-            return (-1, 0)
-        elif action == Action.RIGHT:
-            return (1, 0)
-        else:
-            return (0, 0)
-
-    def _is_valid_position(self, pos: tuple[int, int]) -> bool:
-        """Check if position is within grid bounds."""
-        x, y = pos
-        return 0 <= x < self.size and 0 <= y < self.size
-
-    def _is_adjacent_to_npc(self, pos: tuple[int, int]) -> bool:
-        """Check if position is adjacent to NPC (Manhattan distance = 1)."""
-        dist = abs(pos[0] - self.npc_pos[0]) + abs(pos[1] - self.npc_pos[1])
-        return dist == 1
+        # Don't stay in same mood (force change): offset in [1, len(NPCMood)),
+        # one independent draw per NPC
+        offsets = 1 + counter_integers(
+            self.seed_key,
+            self.episode_count,
+            STREAM_MOOD,
+            len(NPCMood) - 1,
+            np.arange(self.npc_moods.size),
+        )
+        self.npc_moods[:] = (self.npc_moods + offsets) % len(NPCMood)
 
     def render(self) -> str:
         """Simple text rendering for debugging."""
         if self.state is None:
             return "Environment not initialized. Call reset()."
 
-        grid = [["." for _ in range(self.size)] for _ in range(self.size)]
+        grid = np.full((self.size, self.size), ".", dtype="<U1")
+        if self.walls is not None:
+            grid[np.asarray(self.walls, dtype=bool)] = "#"
 
         # Place entities
-        grid[self.state.goal_pos[1]][self.state.goal_pos[0]] = "G"
-        grid[self.state.npc_pos[1]][self.state.npc_pos[0]] = "N"
-        grid[self.state.agent_pos[1]][self.state.agent_pos[0]] = "A"
+        npcs = np.asarray(self.npc_positions)
+        grid[self.state.goal_pos[1], self.state.goal_pos[0]] = "G"
+        grid[npcs[:, 1], npcs[:, 0]] = "N"
+        grid[self.state.agent_pos[1], self.state.agent_pos[0]] = "A"
 
         # Add NPC mood indicator
-        mood_str = f"NPC: {self.state.npc_mood_actual.name}"
-        if self.state.npc_mood_estimate:
+        if len(self._moods) == 1:
+            mood_str = f"NPC: {self.state.npc_mood_actual.name}"
+        else:
+            mood_str = "NPCs: " + ", ".join(_MOODS[m].name for m in self._moods)
+        if self.state.npc_mood_estimate is not None:
             mood_str += f" (Agent believes: {self.state.npc_mood_estimate.name})"
 
-        grid_str = "\n".join([" ".join(row) for row in grid])
+        grid_str = "\n".join(" ".join(row) for row in grid)
         return f"{grid_str}\n{mood_str}\nSteps: {self.state.steps}"
@@ -0,0 +1,145 @@
+"""
+GridStateCodec: Dense integer indexing of SimpleSocialGridWorld states.
+
+Conceptual Framework:
+    Tabular agents key their Q-tables on the agent-observable part of a
+    GridState: (agent_pos, goal_pos, npc_pos, npc_mood_estimate). Goal and NPC
+    are fixed for a given environment layout, so the observable state reduces
+    to (agent cell, mood estimate), which maps onto a dense index in
+    [0, n_states). Q-tables then become plain NumPy arrays of shape
+    (n_states, n_actions).
+
+Index Layout:
+    index = cell * N_MOOD_ESTIMATES + estimate_code
+
+    Where:
+    - cell = y * size + x
+    - estimate_code = 0 for unknown (None), 1 + NPCMood value otherwise
+
+Methodological Note:
+    npc_mood_actual, interaction_count and steps are NOT encoded: the first is
+    hidden from the agent, the counters are not part of the planned Q-table key.
+"""
+
+import numpy as np
+
+from .social_gridworld import N_MOOD_ESTIMATES, GridState, NPCMood, SimpleSocialGridWorld
+
+
+class GridStateCodec:
+    """
+    Bijection between observable GridState content and integer indices.
+
+    Design Rationale:
+        Encoding once per step and indexing arrays avoids hashing a freshly
+        allocated tuple for every Q-table lookup.
+    """
+
+    def __init__(
+        self,
+        size: int = 5,
+        goal_position: tuple[int, int] = (4, 4),
+        npc_position: tuple[int, int] = (2, 2),
+    ):
+        """
+        Initialize codec for a fixed environment layout.
+
+        Args:
+            size: Grid dimensions (size x size)
+            goal_position: Fixed goal location of the environment
+            npc_position: Fixed NPC location of the environment
+        """
+        self.size = size
+        self.goal_pos = goal_position
+        self.npc_pos = npc_position
+        self.n_cells = size * size
+        self.n_states = self.n_cells * N_MOOD_ESTIMATES
+
+    @classmethod
+    def from_env(cls, env: SimpleSocialGridWorld) -> "GridStateCodec":
+        """Build the codec matching an environment's layout."""
+        return cls(size=env.size, goal_position=env.goal_pos, npc_position=env.npc_pos)
+
+    def encode(self, state: GridState) -> int:
+        """
+        Map a GridState to its dense index.
+
+        Raises:
+            ValueError: If the state belongs to a different layout or the
+                agent is off the grid (its index would alias another cell)
+        """
+        if state.goal_pos != self.goal_pos or state.npc_pos != self.npc_pos:
+            raise ValueError("State layout does not match codec (goal or NPC position differs)")
+
+        x, y = state.agent_pos
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            raise ValueError(f"Agent position {(x, y)} outside the {self.size}x{self.size} grid")
+        estimate = state.npc_mood_estimate
+        estimate_code = 0 if estimate is None else int(estimate) + 1
+        return (y * self.size + x) * N_MOOD_ESTIMATES + estimate_code
+
+    def decode(
+        self,
+        index: int,
+        npc_mood_actual: NPCMood = NPCMood.NEUTRAL,
+        interaction_count: int = 0,
+        steps: int = 0,
+    ) -> GridState:
+        """
+        Map a dense index back to a GridState.
+
+        Args:
+            index: State index in [0, n_states)
+            npc_mood_actual: Hidden mood to fill in (not encoded)
+            interaction_count: Counter to fill in (not encoded)
+            steps: Counter to fill in (not encoded)
+        """
+        if not 0 <= index < self.n_states:
+            raise ValueError(f"State index {index} outside [0, {self.n_states})")
+
+        cell, estimate_code = divmod(int(index), N_MOOD_ESTIMATES)
+        y, x = divmod(cell, self.size)
+        return GridState(
+            agent_pos=(x, y),
+            goal_pos=self.goal_pos,
+            npc_pos=self.npc_pos,
+            npc_mood_actual=npc_mood_actual,
+            npc_mood_estimate=None if estimate_code == 0 else NPCMood(estimate_code - 1),
+            interaction_count=interaction_count,
+            steps=steps,
+        )
+
+    def encode_batch(self, agent_cells: np.ndarray, mood_estimates: np.ndarray) -> np.ndarray:
+        """
+        Vectorized encode.
+
+        Args:
+            agent_cells: Flat agent positions (y * size + x)
+            mood_estimates: NPCMood values, -1 for unknown
+
+        Returns:
+            int64 array of state indices
+        """
+        cells = np.asarray(agent_cells, dtype=np.int64)
+        return cells * N_MOOD_ESTIMATES + (np.asarray(mood_estimates, dtype=np.int64) + 1)
+
+    def decode_batch(self, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized decode.
+
+        Returns:
+            (agent_cells, mood_estimates) with -1 marking unknown mood
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        cells, estimate_codes = np.divmod(indices, N_MOOD_ESTIMATES)
+        return cells, (estimate_codes - 1).astype(np.int8)
+
+    def cell_to_pos(self, cells: np.ndarray) -> np.ndarray:
+        """Convert flat cells to (N, 2) array of (x, y)."""
+        cells = np.asarray(cells, dtype=np.int64)
+        return np.stack([cells % self.size, cells // self.size], axis=-1)
+
+    def pos_to_cell(self, positions: np.ndarray) -> np.ndarray:
+        """Convert (N, 2) array of (x, y) to flat cells."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return positions[..., 1] * self.size + positions[..., 0]
@@ -0,0 +1,211 @@
+"""
+Exact Tabular MDP Export for SimpleSocialGridWorld
+
+Conceptual Framework:
+    Within an episode the environment is deterministic given the NPC mood:
+    all randomness lives in the start cell and in between-episode mood
+    changes. The dynamics can therefore be written down exactly, one MDP per
+    NPCMood, and optimal values or policy returns computed by linear algebra
+    instead of Monte Carlo episodes.
+
+MDP State Space (per mood):
+    s = interaction_level * n_obs + obs
+
+    Where:
+    - obs: GridStateCodec index (agent cell, mood estimate)
+    - interaction_level: min(interaction_count, 2). Only the hostile
+      3-interaction termination depends on the count, so counts >= 2 are
+      equivalent for every mood.
+
+Methodological Notes:
+    - Transitions are deterministic, so the transition tensor is stored
+      sparsely as a next-state index per (mood, state, action); dense and
+      scipy.sparse views are built on demand.
+    - terminal marks transitions that end the episode (goal, third hostile
+      interaction). The max_steps timeout is not a state feature; solvers
+      handle it as a finite horizon.
+    - Exports are cached on disk, keyed by the layout parameters that
+      determine the dynamics.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+
+from .layout import layout_digest
+from .social_gridworld import N_MOOD_ESTIMATES, Action, NPCMood, SimpleSocialGridWorld
+
+# Interaction counts 0, 1, 2+ are the only distinguishable levels
+N_INTERACTION_LEVELS = 3
+
+# Bump when the export layout changes so stale cache files are ignored
+_FORMAT_VERSION = 2
+
+_MOOD_REWARD = {NPCMood.FRIENDLY: 1.0, NPCMood.NEUTRAL: 0.0, NPCMood.HOSTILE: -5.0}
+
+
+class TabularMDP(NamedTuple):
+    """
+    Exact dynamics of one environment layout, stacked over NPC moods.
+
+    Array shapes use M = len(NPCMood), S = n_states, A = len(Action).
+    """
+    next_state: np.ndarray  # int32 (M, S, A): deterministic successor
+    reward: np.ndarray  # float64 (M, S, A)
+    terminal: np.ndarray  # bool (M, S, A): transition ends the episode
+    goal_reached: np.ndarray  # bool (M, S, A): transition reaches the goal
+    observation: np.ndarray  # int64 (S,): GridStateCodec index of each state
+    start_states: np.ndarray  # int64: states an episode can start in
+    max_steps: int
+
+    @property
+    def n_moods(self) -> int:
+        return self.next_state.shape[0]
+
+    @property
+    def n_states(self) -> int:
+        return self.next_state.shape[1]
+
+    @property
+    def n_actions(self) -> int:
+        return self.next_state.shape[2]
+
+
+def export_tabular_mdp(
+    env: SimpleSocialGridWorld,
+    cache_dir: str | Path | None = None,
+) -> TabularMDP:
+    """
+    Enumerate every (mood, state, action) of an environment's layout.
+
+    Args:
+        env: Environment whose layout (size, goal, NPC, walls, max_steps) is exported
+        cache_dir: Directory for cached exports (None disables caching)
+
+    Returns:
+        TabularMDP with transitions, rewards and terminal mask
+
+    Raises:
+        ValueError: For multi-NPC environments (moods would be per NPC)
+    """
+    if len(env.npc_positions) != 1:
+        raise ValueError("Tabular export supports single-NPC environments only")
+
+    if cache_dir is not None:
+        path = Path(cache_dir) / f"mdp_{_cache_key(env)}.npz"
+        if path.exists():
+            return _load(path)
+
+    mdp = _build(env)
+
+    if cache_dir is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _save(path, mdp)
+
+    return mdp
+
+
+def dense_transitions(mdp: TabularMDP) -> np.ndarray:
+    """Dense transition tensor P[m, s, a, s'] (float64)."""
+    transitions = np.zeros((mdp.n_moods, mdp.n_states, mdp.n_actions, mdp.n_states))
+    m, s, a = np.indices(mdp.next_state.shape)
+    transitions[m, s, a, mdp.next_state] = 1.0
+    return transitions
+
+
+def sparse_transitions(mdp: TabularMDP, mood: NPCMood | int) -> sparse.csr_matrix:
+    """Sparse transition matrix for one mood, rows indexed by s * A + a."""
+    successors = mdp.next_state[int(mood)].ravel()
+    rows = np.arange(successors.size)
+    return sparse.csr_matrix(
+        (np.ones(successors.size), (rows, successors)),
+        shape=(successors.size, mdp.n_states),
+    )
+
+
+def _build(env: SimpleSocialGridWorld) -> TabularMDP:
+    """Vectorized enumeration over the environment's movement tables."""
+    tables = env.tables
+    n_obs = env.size * env.size * N_MOOD_ESTIMATES
+    n_states = N_INTERACTION_LEVELS * n_obs
+    n_actions = len(Action)
+    goal_cell = env.goal_pos[1] * env.size + env.goal_pos[0]
+
+    states = np.arange(n_states)
+    level, obs = np.divmod(states, n_obs)
+    cell, estimate_code = np.divmod(obs, N_MOOD_ESTIMATES)
+
+    # (S, A) quantities shared by every mood
+    new_cell = tables.next_cell[cell].astype(np.int64)
+    wall = tables.wall_hit[cell]
+    contact = tables.npc_contact[cell]
+    wasted = (np.arange(n_actions) == Action.INTERACT.value) & ~contact
+    goal = (cell[:, None] == goal_cell) | (new_cell == goal_cell)
+    next_level = np.where(
+        contact, np.minimum(level[:, None] + 1, N_INTERACTION_LEVELS - 1), level[:, None]
+    )
+
+    shape = (len(NPCMood), n_states, n_actions)
+    next_state = np.empty(shape, dtype=np.int32)
+    reward = np.empty(shape)
+    terminal = np.empty(shape, dtype=bool)
+    goal_reached = np.broadcast_to(goal, shape).copy()
+
+    for mood in NPCMood:
+        # Same operation order as SimpleSocialGridWorld.step_fast (exact floats)
+        r = np.full((n_states, n_actions), -0.1)
+        r = r + np.where(contact, _MOOD_REWARD[mood], 0.0)
+        r = r - np.where(wasted, 0.5, 0.0)
+        r = r - np.where(wall, 1.0, 0.0)
+        r = r + np.where(goal, 10.0, 0.0)
+
+        hostile_end = contact & (mood == NPCMood.HOSTILE) & (level[:, None] == 2)
+        new_estimate_code = np.where(contact, mood.value + 1, estimate_code[:, None])
+
+        next_obs = new_cell * N_MOOD_ESTIMATES + new_estimate_code
+        next_state[mood.value] = next_level * n_obs + next_obs
+        reward[mood.value] = r
+        terminal[mood.value] = goal | hostile_end
+
+    start_states = env.start_cells.astype(np.int64) * N_MOOD_ESTIMATES  # level 0, unknown mood
+
+    return TabularMDP(
+        next_state=next_state,
+        reward=reward,
+        terminal=terminal,
+        goal_reached=goal_reached,
+        observation=obs.astype(np.int64),
+        start_states=start_states,
+        max_steps=env.max_steps,
+    )
+
+
+def _cache_key(env: SimpleSocialGridWorld) -> str:
+    """Hash of the constructor parameters that determine the dynamics."""
+    params = (
+        _FORMAT_VERSION,
+        env.size,
+        tuple(env.npc_pos),
+        tuple(env.goal_pos),
+        env.max_steps,
+        None if env.walls is None else layout_digest(env.walls),
+    )
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+
+
+def _save(path: Path, mdp: TabularMDP) -> None:
+    # Write then rename so concurrent workers never read a partial file
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, **mdp._asdict())
+    tmp.replace(path)
+
+
+def _load(path: Path) -> TabularMDP:
+    with np.load(path) as data:
+        fields = {name: data[name] for name in TabularMDP._fields}
+    fields["max_steps"] = int(fields["max_steps"])
+    return TabularMDP(**fields)
@@ -0,0 +1,453 @@
+"""
+VectorSocialGridWorld: Batched SimpleSocialGridWorld for large experiment sweeps.
+
+Conceptual Framework:
+    Steps N independent copies ("lanes") of the social gridworld with a single
+    call. Each lane follows exactly the same dynamics and reward logic as
+    SimpleSocialGridWorld.step, but all per-lane quantities live in NumPy
+    arrays so one Python call advances every lane.
+
+Methodological Design Decisions:
+    1. Positions stored as flat cell indices (y * size + x) for cheap indexing
+    2. Moods stored as NPCMood values (int8); unknown mood estimate is -1
+    3. No per-step objects: step() returns preallocated-style arrays only
+    4. Domain channels (state/agent reward and error) kept as aligned float32
+       arrays, so State and Agent modules consume their signals in bulk
+    5. Optional same-step autoreset: finished lanes restart inside step(), with
+       their terminal observation and episode statistics returned alongside
+    6. Per-lane parameters: movement tables of every distinct (NPC, goal)
+       layout are stacked into one table, and each lane indexes it with its
+       layout's cell offset, so heterogeneous lanes share one kernel call
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from .distance_fields import DistanceFields, get_distance_fields, layout_key
+from .episode_stats import EpisodeStats
+from .layout import validate_walls
+from .seeding import STREAM_MOOD, STREAM_START, SeedLike, counter_integers, lane_keys
+from .social_gridworld import (
+    MovementTables,
+    NPCMood,
+    build_movement_tables,
+    build_start_cells,
+    generate_mood_schedule,
+    mood_change_episodes,
+    step_kernel,
+    validate_actions,
+)
+from .state_codec import GridStateCodec
+
+
+class VectorStep(NamedTuple):
+    """
+    Per-lane results of one batched step.
+
+    Episode bookkeeping (final_obs, episode_return, episode_length) is only
+    meaningful where done is True; other lanes hold their current values
+    (final_obs) or zeros.
+    """
+    reward: np.ndarray  # float64 (N,)
+    done: np.ndarray  # bool (N,)
+    state_error: np.ndarray  # float32 (N,) navigation mistakes
+    agent_error: np.ndarray  # float32 (N,) social assessment mistakes
+    obs: np.ndarray  # int64 (N,) state indices (after autoreset, if enabled)
+    final_obs: np.ndarray  # int64 (N,) state indices before autoreset
+    episode_return: np.ndarray  # float64 (N,) summed reward of finished episodes
+    episode_length: np.ndarray  # int32 (N,) steps of finished episodes
+    state_reward: np.ndarray  # float32 (N,) navigation share of reward
+    agent_reward: np.ndarray  # float32 (N,) social share of reward
+
+
+class VectorSocialGridWorld:
+    """
+    N lanes of SimpleSocialGridWorld stepped in lockstep.
+
+    Design Rationale:
+        The 540-run sweep is dominated by interpreter overhead when each run
+        steps a scalar environment. Keeping lane state in arrays moves the
+        per-step work into NumPy.
+
+    Lane State (all arrays of length num_envs):
+        agent_cell: Flat agent position (y * size + x)
+        moods: Actual NPC mood (hidden from agent)
+        mood_estimates: Agent's belief about NPC mood (-1 = unknown)
+        interaction_counts: Interactions in current episode
+        steps: Steps taken in current episode
+        episode_counts: Episodes started (drives mood changes)
+        episode_returns: Reward accumulated in current episode
+
+    Lane Parameters (arrays of length num_envs, scalars are broadcast):
+        mood_change_freq, max_steps, goal_positions (N, 2), npc_positions (N, 2)
+
+        A 20 seeds x 5 mood-change frequencies sweep is one batch:
+            VectorSocialGridWorld(
+                num_envs=100,
+                seed=np.tile(np.arange(20), 5).tolist(),
+                mood_change_frequency=np.repeat([25, 50, 75, 100, 150], 20),
+            )
+
+    Reward Structure:
+        Identical to SimpleSocialGridWorld.step (see that class).
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        size: int = 5,
+        npc_position: tuple[int, int] | np.ndarray = (2, 2),
+        goal_position: tuple[int, int] | np.ndarray = (4, 4),
+        mood_change_frequency: int | np.ndarray = 75,
+        max_steps: int | np.ndarray = 50,
+        seed: SeedLike | Sequence[SeedLike] = None,
+        autoreset: bool = False,
+        walls: np.ndarray | None = None,
+        mood_schedule: np.ndarray | None = None,
+        stats_capacity: int = 10_000,
+    ):
+        """
+        Initialize batched environment.
+
+        Args:
+            num_envs: Number of lanes stepped per call
+            size: Grid dimensions (size x size)
+            npc_position: Fixed NPC location, (x, y) or per lane (N, 2)
+            goal_position: Fixed goal location, (x, y) or per lane (N, 2)
+            mood_change_frequency: Episodes between NPC mood changes (or per lane)
+            max_steps: Maximum steps per episode before timeout (or per lane)
+            seed: Root seed (lane i uses SeedSequence(seed, spawn_key=(i,))) or
+                a sequence of per-lane seeds; lane with seed s reproduces
+                SimpleSocialGridWorld(seed=s) episode for episode
+            autoreset: Reset finished lanes inside step() (Gymnasium style)
+            walls: Boolean occupancy array (size, size) shared by all lanes
+            mood_schedule: Mood per episode, (n_episodes,) shared by all lanes
+                or (num_envs, n_episodes) per lane; replaces live mood changes
+            stats_capacity: Finished episodes retained by episode_stats
+        """
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+
+        self.num_envs = num_envs
+        self.size = size
+        self.npc_positions = _lane_positions(npc_position, num_envs, "npc_position")
+        self.goal_positions = _lane_positions(goal_position, num_envs, "goal_position")
+        self.mood_change_freq = _lane_values(
+            mood_change_frequency, num_envs, "mood_change_frequency"
+        )
+        self.max_steps = _lane_values(max_steps, num_envs, "max_steps")
+        self.autoreset = autoreset
+
+        self.npc_cell = self.npc_positions[:, 1] * size + self.npc_positions[:, 0]
+        self.goal_cell = self.goal_positions[:, 1] * size + self.goal_positions[:, 0]
+
+        # Codec indexing depends on the grid size only, so one codec serves all layouts
+        self.codec = GridStateCodec(
+            size, tuple(self.goal_positions[0]), tuple(self.npc_positions[0])
+        )
+        if walls is not None:
+            validate_walls(
+                walls, size, np.vstack([self.goal_positions, self.npc_positions]).tolist()
+            )
+        self.walls = walls
+
+        # One stacked table over the distinct (NPC, goal) layouts; lane cells
+        # are shifted by their layout's offset before every lookup
+        self.layouts, layout_ids = np.unique(
+            np.hstack([self.npc_positions, self.goal_positions]), axis=0, return_inverse=True
+        )
+        self.layout_ids = layout_ids.ravel()
+        self.tables, self.start_cells, self.start_offsets = _stack_layouts(
+            size, self.layouts, walls
+        )
+        self._cell_offset = self.layout_ids.astype(np.int64) * size * size
+        self._distance_fields: DistanceFields | None = None  # Built on first use
+        self.seed_keys = lane_keys(seed, num_envs)
+
+        # Lane state
+        self.agent_cell = np.zeros(num_envs, dtype=np.int64)
+        self.moods = np.full(num_envs, NPCMood.NEUTRAL.value, dtype=np.int8)
+        self.mood_estimates = np.full(num_envs, -1, dtype=np.int8)
+        self.interaction_counts = np.zeros(num_envs, dtype=np.int32)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.episode_counts = np.zeros(num_envs, dtype=np.int64)
+        self.episode_returns = np.zeros(num_envs)
+
+        # Finished episodes of all lanes, in lane order within a step
+        self.episode_stats = EpisodeStats(stats_capacity, window=min(100, stats_capacity))
+
+        self.mood_schedule: np.ndarray | None = None
+        if mood_schedule is not None:
+            self.set_mood_schedule(mood_schedule)
+
+        self._initialized = False
+
+    def set_mood_schedule(self, schedule: np.ndarray | None) -> None:
+        """
+        Serve moods from a schedule (None restores live mood changes).
+
+        Args:
+            schedule: NPCMood values, (n_episodes,) for every lane or
+                (num_envs, n_episodes); column k-1 is used by episode k
+        """
+        if schedule is None:
+            self.mood_schedule = None
+            return
+        schedule = np.asarray(schedule, dtype=np.int8)
+        if schedule.ndim == 1:
+            schedule = np.broadcast_to(schedule, (self.num_envs, schedule.size))
+        if schedule.ndim != 2 or schedule.shape[0] != self.num_envs:
+            raise ValueError(
+                f"mood_schedule must have shape (n_episodes,) or ({self.num_envs}, n_episodes), "
+                f"got {schedule.shape}"
+            )
+        if schedule.size and (schedule.min() < 0 or schedule.max() >= len(NPCMood)):
+            raise ValueError("mood_schedule contains values outside NPCMood")
+        self.mood_schedule = schedule
+
+    def precompute_mood_schedule(self, n_episodes: int) -> np.ndarray:
+        """
+        Generate and install per-lane schedules for episodes 1..n_episodes,
+        equal to the moods the live per-reset draws would produce.
+        """
+        schedule = np.stack([
+            generate_mood_schedule(int(key), n_episodes, int(freq))[:, 0]
+            for key, freq in zip(self.seed_keys, self.mood_change_freq)
+        ])
+        self.set_mood_schedule(schedule)
+        return schedule
+
+    def mood_change_episodes(self, lane: int) -> np.ndarray:
+        """
+        Episodes at which lane's NPC mood changes (requires a schedule).
+
+        Schedules here are lane-major (num_envs, n_episodes), so the
+        module-level mood_change_episodes() helper, which expects
+        (n_episodes, n_npcs), must be given one lane's row; this does that.
+        """
+        if self.mood_schedule is None:
+            raise RuntimeError("No mood schedule installed; see precompute_mood_schedule()")
+        return mood_change_episodes(self.mood_schedule[lane], (NPCMood.NEUTRAL.value,))
+
+    @property
+    def agent_pos(self) -> np.ndarray:
+        """Agent positions as (N, 2) array of (x, y)."""
+        return self.codec.cell_to_pos(self.agent_cell)
+
+    def action_masks(self) -> np.ndarray:
+        """Valid-action mask (N, actions) for every lane's current cell."""
+        return self.tables.valid_actions[self._cell_offset + self.agent_cell]
+
+    @property
+    def distance_fields(self) -> DistanceFields:
+        """
+        BFS distance fields over the stacked layouts, indexed like the
+        movement tables: field[lane offset + cell] (see distance_to_goal).
+        """
+        if self._distance_fields is None:
+            self._distance_fields = _stack_distance_fields(
+                self.size, self.layouts, self.walls, self.tables
+            )
+        return self._distance_fields
+
+    def distance_to_goal(self) -> np.ndarray:
+        """Shortest number of moves from every lane's cell to its goal."""
+        return self.distance_fields.to_goal[self._cell_offset + self.agent_cell]
+
+    def observations(self) -> np.ndarray:
+        """Agent-observable state of every lane as GridStateCodec indices."""
+        return self.codec.encode_batch(self.agent_cell, self.mood_estimates)
+
+    def reset(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Reset all lanes, or only the lanes selected by a boolean mask.
+
+        Mirrors SimpleSocialGridWorld.reset per lane: episode counter is
+        incremented, mood changes every mood_change_frequency episodes, and
+        the agent starts at a random cell that is neither goal nor NPC.
+        All selected lanes are sampled with a single vectorized draw.
+
+        Returns:
+            State indices of all lanes (see GridStateCodec)
+        """
+        if mask is None:
+            lanes = np.arange(self.num_envs)
+        else:
+            lanes = np.flatnonzero(mask)
+
+        self.episode_counts[lanes] += 1
+
+        # Mood changes for lanes hitting the change frequency (or scheduled)
+        if self.mood_schedule is not None:
+            columns = self.episode_counts[lanes] - 1
+            if columns.size and columns.max() >= self.mood_schedule.shape[1]:
+                raise RuntimeError(
+                    f"Mood schedule covers {self.mood_schedule.shape[1]} episodes, "
+                    f"episode {columns.max() + 1} requested"
+                )
+            self.moods[lanes] = self.mood_schedule[lanes, columns]
+        else:
+            changing = lanes[self.episode_counts[lanes] % self.mood_change_freq[lanes] == 0]
+            if changing.size:
+                self.moods[changing] = self._next_moods(changing)
+
+        # Random starting cells for all lanes in one draw: index directly into
+        # the permissible cells of each lane's layout, no rejection loop
+        layouts = self.layout_ids[lanes]
+        first = self.start_offsets[layouts]
+        picks = counter_integers(
+            self.seed_keys[lanes],
+            self.episode_counts[lanes],
+            STREAM_START,
+            self.start_offsets[layouts + 1] - first,
+        )
+        cells = self.start_cells[first + picks]
+
+        self.agent_cell[lanes] = cells
+        self.mood_estimates[lanes] = -1
+        self.interaction_counts[lanes] = 0
+        self.steps[lanes] = 0
+        self.episode_returns[lanes] = 0.0
+
+        self._initialized = True
+        return self.observations()
+
+    def step(self, actions: np.ndarray) -> VectorStep:
+        """
+        Execute one action per lane.
+
+        Args:
+            actions: Integer array (N,) of Action values
+
+        Returns:
+            VectorStep with per-lane rewards, termination, domain errors,
+            observations and statistics of episodes that just ended
+
+        Reward Logic:
+            step_kernel, followed by the timeout check.
+
+        Autoreset:
+            With autoreset enabled, lanes that finish are reset before
+            returning: obs holds their new initial state, final_obs the
+            terminal one.
+        """
+        if not self._initialized:
+            raise RuntimeError("Must call reset() before step()")
+
+        actions = validate_actions(actions, self.num_envs)
+
+        offset = self._cell_offset
+        kernel = step_kernel(
+            self.tables, self.goal_cell + offset, self.agent_cell + offset, actions, self.moods,
+            self.interaction_counts,
+        )
+        self.mood_estimates[kernel.contact] = self.moods[kernel.contact]
+        self.interaction_counts[:] = kernel.interaction_counts
+        reward = kernel.reward
+        done = kernel.terminal
+
+        # Timeout check
+        self.steps += 1
+        done |= self.steps >= self.max_steps
+
+        self.agent_cell[:] = kernel.next_cell - offset
+
+        # Episode bookkeeping
+        self.episode_returns += reward
+        episode_return = np.where(done, self.episode_returns, 0.0)
+        episode_length = np.where(done, self.steps, 0)
+        if done.any():
+            self.episode_stats.add_batch(
+                self.episode_returns[done], self.steps[done], kernel.goal_reached[done]
+            )
+
+        final_obs = self.observations()
+        if self.autoreset and done.any():
+            obs = self.reset(done)
+        else:
+            obs = final_obs
+
+        return VectorStep(
+            reward=reward,
+            done=done,
+            state_error=kernel.state_error.astype(np.float32),
+            agent_error=kernel.agent_error.astype(np.float32),
+            obs=obs,
+            final_obs=final_obs,
+            episode_return=episode_return,
+            episode_length=episode_length,
+            state_reward=kernel.state_reward.astype(np.float32),
+            agent_reward=kernel.agent_reward.astype(np.float32),
+        )
+
+    def _next_moods(self, lanes: np.ndarray) -> np.ndarray:
+        """Draw a different mood for each lane (never stays in same mood)."""
+        offsets = 1 + counter_integers(
+            self.seed_keys[lanes], self.episode_counts[lanes], STREAM_MOOD, len(NPCMood) - 1
+        )
+        return ((self.moods[lanes] + offsets) % len(NPCMood)).astype(np.int8)
+
+
+def _lane_values(value: int | np.ndarray, num_envs: int, name: str) -> np.ndarray:
+    """Broadcast a scalar parameter to lanes, or validate a per-lane array."""
+    values = np.asarray(value, dtype=np.int64)
+    if values.ndim == 0:
+        return np.full(num_envs, values)
+    if values.shape != (num_envs,):
+        raise ValueError(f"{name} must be a scalar or have shape ({num_envs},), got {values.shape}")
+    return values.copy()
+
+
+def _lane_positions(value: tuple[int, int] | np.ndarray, num_envs: int, name: str) -> np.ndarray:
+    """Broadcast an (x, y) position to lanes, or validate a per-lane (N, 2) array."""
+    positions = np.asarray(value, dtype=np.int64)
+    if positions.shape == (2,):
+        return np.tile(positions, (num_envs, 1))
+    if positions.shape != (num_envs, 2):
+        raise ValueError(
+            f"{name} must be (x, y) or have shape ({num_envs}, 2), got {positions.shape}"
+        )
+    return positions.copy()
+
+
+def _stack_layouts(
+    size: int, layouts: np.ndarray, walls: np.ndarray | None
+) -> tuple[MovementTables, np.ndarray, np.ndarray]:
+    """
+    Concatenate per-layout movement tables and start cells.
+
+    Args:
+        layouts: (L, 4) rows of (npc_x, npc_y, goal_x, goal_y)
+
+    Returns:
+        (tables over L * size * size cells with next_cell shifted into the
+        stacked index space, concatenated start cells, start offsets (L + 1,))
+    """
+    n_cells = size * size
+    tables = []
+    starts = []
+    for layout, (npc_x, npc_y, goal_x, goal_y) in enumerate(layouts.tolist()):
+        layout_tables = build_movement_tables(size, [(npc_x, npc_y)], walls)
+        tables.append(layout_tables._replace(next_cell=layout_tables.next_cell + layout * n_cells))
+        starts.append(build_start_cells(size, [(goal_x, goal_y), (npc_x, npc_y)], walls))
+
+    stacked = MovementTables(*(np.concatenate(fields) for fields in zip(*tables)))
+    offsets = np.concatenate([[0], np.cumsum([s.size for s in starts])]).astype(np.int64)
+    return stacked, np.concatenate(starts), offsets
+
+
+def _stack_distance_fields(
+    size: int, layouts: np.ndarray, walls: np.ndarray | None, tables: MovementTables
+) -> DistanceFields:
+    """Concatenate the cached distance fields of each layout (rows as in _stack_layouts)."""
+    n_cells = size * size
+    fields = []
+    for layout, (npc_x, npc_y, goal_x, goal_y) in enumerate(layouts.tolist()):
+        rows = slice(layout * n_cells, (layout + 1) * n_cells)
+        layout_tables = MovementTables(*(table[rows] for table in tables))
+        layout_tables = layout_tables._replace(next_cell=layout_tables.next_cell - layout * n_cells)
+        key = layout_key(size, (goal_x, goal_y), [(npc_x, npc_y)], walls)
+        fields.append(get_distance_fields(key, layout_tables, goal_y * size + goal_x))
+    return DistanceFields(*(np.concatenate(field) for field in zip(*fields)))
@@ -4,8 +4,28 @@ from .arousal import (
     ArousalMonitor,
     ArousalIntegrator,
 )
+from .mdp_solver import (
+    OptimalSolution,
+    PolicyEvaluation,
+    evaluate_policies,
+    evaluate_policies_discounted,
+    value_iteration,
+)
+from .replay import ReplayCheck, ReplayResult, replay_episodes, replay_recording
+from .trajectory import TrajectoryReader, TrajectoryRecorder
 
 __all__ = [
     "ArousalMonitor",
     "ArousalIntegrator",
+    "OptimalSolution",
+    "PolicyEvaluation",
+    "evaluate_policies",
+    "evaluate_policies_discounted",
+    "value_iteration",
+    "TrajectoryRecorder",
+    "TrajectoryReader",
+    "ReplayResult",
+    "ReplayCheck",
+    "replay_episodes",
+    "replay_recording",
 ]
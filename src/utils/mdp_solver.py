@@ -0,0 +1,234 @@
+"""
+Exact Optimal-Value Oracle and Policy Evaluation for SimpleSocialGridWorld
+
+Conceptual Purpose:
+    Convergence metric M1 ("episodes to 95% of max performance") needs the
+    true optimum, not a maximum read off noisy learning curves. This module
+    solves the exported TabularMDP for all NPC moods at once, and scores
+    trained tabular policies exactly instead of through sampled episodes.
+
+Methodological Design:
+    The max_steps timeout makes the episode a finite-horizon problem, so
+    value iteration runs as backward induction over the remaining steps:
+
+        V_0 = 0
+        Q_h(s, a) = R(s, a) + gamma * (1 - terminal(s, a)) * V_{h-1}(s')
+        V_h(s) = max_a Q_h(s, a)
+
+    With h = max_steps this is exact for the environment (including the
+    friendly-NPC case, where repeated interaction until timeout can beat
+    walking to the goal). Every iteration is one gather over the
+    (mood, state, action) tensor, batched over moods.
+
+    Policy evaluation uses the same recursion on the Markov chain induced by
+    a fixed policy, batched over policies as well. The undiscounted chain is
+    singular whenever a policy loops (e.g. standing still until timeout), so
+    the timeout-exact recursion is the default; the infinite-horizon
+    discounted variant is a single sparse linear solve.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+from ..environment.tabular_mdp import TabularMDP
+
+
+class OptimalSolution(NamedTuple):
+    """
+    Optimal values of a TabularMDP, per NPC mood.
+
+    Shapes use M = moods, S = states, A = actions, H = horizon.
+    """
+    v_star: np.ndarray  # (M, S): optimal value at episode start (H steps left)
+    q_star: np.ndarray  # (M, S, A): optimal action values at episode start
+    policy: np.ndarray  # (H, M, S) int8: optimal action after t steps taken
+    start_return: np.ndarray  # (M,): expected optimal return from start distribution
+
+
+class PolicyEvaluation(NamedTuple):
+    """
+    Exact performance of tabular policies from every start cell and mood.
+
+    Shapes use P = policies, M = moods, C = start cells (mdp.start_states);
+    the P axis is dropped when a single policy is evaluated.
+    """
+    returns: np.ndarray  # (P, M, C): expected episode return
+    success: np.ndarray  # (P, M, C): probability of reaching the goal
+    mean_return: np.ndarray  # (P, M): averaged over the start distribution
+    success_rate: np.ndarray  # (P, M): averaged over the start distribution
+
+
+def value_iteration(
+    mdp: TabularMDP,
+    gamma: float = 1.0,
+    horizon: int | None = None,
+) -> OptimalSolution:
+    """
+    Finite-horizon value iteration over all moods simultaneously.
+
+    Args:
+        mdp: Exported environment dynamics
+        gamma: Discount factor (1.0 matches the undiscounted episode return)
+        horizon: Steps per episode (defaults to the environment's max_steps)
+
+    Returns:
+        OptimalSolution with V*, Q*, time-indexed greedy policy and the
+        expected optimal return under the uniform start-cell distribution
+    """
+    horizon = mdp.max_steps if horizon is None else horizon
+    if horizon < 1:
+        raise ValueError(f"horizon must be positive, got {horizon}")
+
+    n_moods, n_states, n_actions = mdp.next_state.shape
+
+    # Flat successor indices into V.ravel(), continuation mask folded into gamma
+    mood_offset = (np.arange(n_moods) * n_states)[:, None, None]
+    successors = (mdp.next_state + mood_offset).ravel()
+    continuation = gamma * (~mdp.terminal)
+
+    policy = np.empty((horizon, n_moods, n_states), dtype=np.int8)
+    values = np.zeros(n_moods * n_states)
+    q_values = mdp.reward
+
+    # h = steps remaining; the decision with h steps left is taken at t = horizon - h
+    for h in range(1, horizon + 1):
+        q_values = mdp.reward + continuation * values[successors].reshape(mdp.reward.shape)
+        actions = q_values.argmax(axis=2)
+        values = np.take_along_axis(q_values, actions[:, :, None], axis=2).ravel()
+        policy[horizon - h] = actions
+
+    v_star = values.reshape(n_moods, n_states)
+    start_return = v_star[:, mdp.start_states].mean(axis=1)
+
+    return OptimalSolution(
+        v_star=v_star,
+        q_star=q_values,
+        policy=policy,
+        start_return=start_return,
+    )
+
+
+def evaluate_policies(
+    mdp: TabularMDP,
+    policies: np.ndarray,
+    gamma: float = 1.0,
+    horizon: int | None = None,
+) -> PolicyEvaluation:
+    """
+    Exact expected return and success probability of tabular policies.
+
+    Args:
+        mdp: Exported environment dynamics
+        policies: Actions indexed by GridStateCodec state, shape (n_obs,) or
+            (P, n_obs) for a batch (e.g. seeds x configs)
+        gamma: Discount factor (1.0 matches the undiscounted episode return)
+        horizon: Steps per episode (defaults to the environment's max_steps)
+
+    Returns:
+        PolicyEvaluation per policy, mood and start cell
+    """
+    horizon = mdp.max_steps if horizon is None else horizon
+    if horizon < 1:
+        raise ValueError(f"horizon must be positive, got {horizon}")
+
+    single = np.ndim(policies) == 1
+    successors, reward, terminal, goal = _induced_chain(mdp, policies)
+
+    continuation = ~terminal
+    values = np.zeros(successors.size)
+    success = np.zeros(successors.size)
+    for _ in range(horizon):
+        values = reward + gamma * continuation * values[successors]
+        success = goal + continuation * success[successors]
+
+    return _summarize(mdp, values, success, single)
+
+
+def evaluate_policies_discounted(
+    mdp: TabularMDP,
+    policies: np.ndarray,
+    gamma: float,
+) -> np.ndarray:
+    """
+    Infinite-horizon discounted values by one sparse linear solve.
+
+    Solves (I - gamma * P_pi) v = r_pi for every policy and mood at once
+    (block-diagonal system). Ignores the max_steps timeout.
+
+    Args:
+        mdp: Exported environment dynamics
+        policies: Actions indexed by GridStateCodec state, (n_obs,) or (P, n_obs)
+        gamma: Discount factor in [0, 1)
+
+    Returns:
+        Expected discounted return, shape (P, M, C) or (M, C)
+    """
+    if not 0.0 <= gamma < 1.0:
+        raise ValueError(f"gamma must be in [0, 1) for the linear solve, got {gamma}")
+
+    single = np.ndim(policies) == 1
+    successors, reward, terminal, _ = _induced_chain(mdp, policies)
+
+    n = successors.size
+    rows = np.flatnonzero(~terminal)
+    chain = sparse.csr_matrix(
+        (np.full(rows.size, gamma), (rows, successors[rows])), shape=(n, n)
+    )
+    values = sparse_linalg.spsolve((sparse.identity(n, format="csr") - chain).tocsc(), reward)
+
+    n_moods, n_states = mdp.n_moods, mdp.n_states
+    starts = values.reshape(-1, n_moods, n_states)[:, :, mdp.start_states]
+    return starts[0] if single else starts
+
+
+def _induced_chain(
+    mdp: TabularMDP, policies: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten the Markov chains induced by a batch of policies.
+
+    Returns successor index, reward, terminal and goal flag per chain state,
+    with chain states ordered (policy, mood, state).
+    """
+    policies = np.atleast_2d(np.asarray(policies, dtype=np.int64))
+    n_obs = int(mdp.observation.max()) + 1
+    if policies.shape[1] != n_obs:
+        raise ValueError(f"Policies must cover {n_obs} states, got {policies.shape[1]}")
+
+    n_policies = policies.shape[0]
+    n_moods, n_states = mdp.n_moods, mdp.n_states
+
+    actions = policies[:, mdp.observation][:, None, :]  # (P, 1, S)
+    moods = np.arange(n_moods)[None, :, None]
+    states = np.arange(n_states)[None, None, :]
+
+    next_state = mdp.next_state[moods, states, actions]  # (P, M, S)
+    offsets = (np.arange(n_policies * n_moods) * n_states).reshape(n_policies, n_moods, 1)
+
+    return (
+        (next_state + offsets).ravel(),
+        mdp.reward[moods, states, actions].ravel(),
+        mdp.terminal[moods, states, actions].ravel(),
+        mdp.goal_reached[moods, states, actions].ravel().astype(np.float64),
+    )
+
+
+def _summarize(
+    mdp: TabularMDP, values: np.ndarray, success: np.ndarray, single: bool
+) -> PolicyEvaluation:
+    shape = (-1, mdp.n_moods, mdp.n_states)
+    returns = values.reshape(shape)[:, :, mdp.start_states]
+    reached = success.reshape(shape)[:, :, mdp.start_states]
+
+    evaluation = PolicyEvaluation(
+        returns=returns,
+        success=reached,
+        mean_return=returns.mean(axis=2),
+        success_rate=reached.mean(axis=2),
+    )
+    if single:
+        return PolicyEvaluation(*(field[0] for field in evaluation))
+    return evaluation
@@ -0,0 +1,172 @@
+"""
+Deterministic Trajectory Replay
+
+Conceptual Purpose:
+    Within an episode the environment is deterministic given the start cell
+    and NPC mood, so a recorded run is fully described by its action
+    sequences plus those two per-episode values. Replaying them regenerates
+    states, rewards and error channels without an agent in the loop, which
+    is both a cheap way to rebuild plots and a regression check that the
+    dynamics have not drifted since the run was recorded.
+
+Methodological Design:
+    All episodes advance in lockstep over time through step_kernel, the
+    same batched transition VectorSocialGridWorld uses. Ragged episodes are
+    padded to the longest one and masked, so replay cost is
+    O(max_length) array operations regardless of the episode count.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ..environment.social_gridworld import N_MOOD_ESTIMATES, SimpleSocialGridWorld, step_kernel
+from .trajectory import TrajectoryReader
+
+
+class ReplayResult(NamedTuple):
+    """
+    Regenerated step columns, flat in the input order (episode-major).
+
+    Steps after the environment ended an episode (only possible when the
+    recorded actions run past a terminal state) are left as padding:
+    state -1, reward 0.
+    """
+    states: np.ndarray  # int64 (steps,): state index the action was taken in
+    rewards: np.ndarray  # float64 (steps,)
+    done: np.ndarray  # bool (steps,)
+    state_error: np.ndarray  # float64 (steps,)
+    agent_error: np.ndarray  # float64 (steps,)
+    returns: np.ndarray  # float64 (E,): summed reward per episode
+    lengths: np.ndarray  # int64 (E,): steps until the environment ended the episode
+
+
+class ReplayCheck(NamedTuple):
+    """Replay of a recording compared against what was recorded."""
+    result: ReplayResult
+    mismatched: np.ndarray  # int64: episodes whose replay differs from the recording
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatched.size == 0
+
+
+def replay_episodes(
+    env: SimpleSocialGridWorld,
+    actions: np.ndarray,
+    lengths: np.ndarray,
+    start_cells: np.ndarray,
+    moods: np.ndarray,
+) -> ReplayResult:
+    """
+    Regenerate episodes from their actions, start cells and NPC moods.
+
+    Args:
+        env: Environment providing the layout (tables, goal, max_steps);
+            its own state is not touched
+        actions: Flat action sequence of all episodes, episode-major
+        lengths: Steps per episode (sums to len(actions))
+        start_cells: Flat start cell per episode (y * size + x)
+        moods: Actual NPC mood value per episode
+
+    Returns:
+        ReplayResult with regenerated per-step columns and episode totals
+    """
+    if len(env.npc_positions) != 1:
+        raise ValueError("Replay supports single-NPC environments only")
+
+    actions = np.asarray(actions, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if lengths.sum() != actions.size:
+        raise ValueError(f"lengths sum to {lengths.sum()}, but {actions.size} actions given")
+
+    n_episodes = lengths.size
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    goal_cell = env.goal_pos[1] * env.size + env.goal_pos[0]
+
+    states = np.full(actions.size, -1, dtype=np.int64)
+    rewards = np.zeros(actions.size)
+    done = np.zeros(actions.size, dtype=bool)
+    state_error = np.zeros(actions.size)
+    agent_error = np.zeros(actions.size)
+
+    # Lane state, one lane per episode
+    cells = np.asarray(start_cells, dtype=np.int64).copy()
+    moods = np.asarray(moods, dtype=np.int8)
+    estimates = np.full(n_episodes, -1, dtype=np.int64)
+    counts = np.zeros(n_episodes, dtype=np.int32)
+    replay_lengths = np.zeros(n_episodes, dtype=np.int64)
+    running = lengths > 0
+
+    for t in range(int(lengths.max(initial=0))):
+        lanes = np.flatnonzero(running)
+        if lanes.size == 0:
+            break
+        rows = offsets[lanes] + t
+
+        kernel = step_kernel(
+            env.tables, goal_cell, cells[lanes], actions[rows], moods[lanes], counts[lanes]
+        )
+        ended = kernel.terminal | (t + 1 >= env.max_steps)
+
+        states[rows] = cells[lanes] * N_MOOD_ESTIMATES + estimates[lanes] + 1
+        rewards[rows] = kernel.reward
+        done[rows] = ended
+        state_error[rows] = kernel.state_error
+        agent_error[rows] = kernel.agent_error
+
+        contact = lanes[kernel.contact]
+        estimates[contact] = moods[contact]
+        counts[lanes] = kernel.interaction_counts
+        cells[lanes] = kernel.next_cell
+        replay_lengths[lanes] = t + 1
+        running[lanes] = ~ended & (t + 1 < lengths[lanes])
+
+    returns = np.add.reduceat(rewards, offsets) if actions.size else np.zeros(n_episodes)
+    return ReplayResult(
+        states=states,
+        rewards=rewards,
+        done=done,
+        state_error=state_error,
+        agent_error=agent_error,
+        returns=returns,
+        lengths=replay_lengths,
+    )
+
+
+def replay_recording(env: SimpleSocialGridWorld, reader: TrajectoryReader) -> ReplayCheck:
+    """
+    Replay a recorded run and compare it step by step with the recording.
+
+    Start cells come from each episode's first recorded state, moods from the
+    episode index (episodes must be recorded with begin_episode(npc_mood)).
+
+    Args:
+        env: Environment with the layout the run was recorded in
+        reader: Recorded run
+
+    Returns:
+        ReplayCheck listing every episode whose states, rewards, done flags
+        or error channels differ from the recording
+    """
+    if (reader.episode_mood < 0).any():
+        raise ValueError("Replay needs the NPC mood of every episode (see begin_episode)")
+
+    lengths = reader.episode_length.astype(np.int64)
+    actions = reader.column("action")
+    recorded_states = reader.column("state").astype(np.int64)
+
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    start_cells = recorded_states[offsets] // N_MOOD_ESTIMATES
+
+    result = replay_episodes(env, actions, lengths, start_cells, reader.episode_mood)
+
+    step_matches = (
+        (result.states == recorded_states)
+        & (result.rewards == reader.column("reward"))
+        & (result.done == reader.column("done"))
+        & (result.state_error == reader.column("state_error"))
+        & (result.agent_error == reader.column("agent_error"))
+    )
+    episode_ok = np.logical_and.reduceat(step_matches, offsets) if actions.size else step_matches
+    return ReplayCheck(result=result, mismatched=np.flatnonzero(~episode_ok))
@@ -0,0 +1,329 @@
+"""
+Columnar Trajectory Recording for Arousal Dynamics Analysis
+
+Conceptual Purpose:
+    Arousal analysis needs every step of every episode, but a Transition
+    (two GridStates and an info dict) costs hundreds of bytes of Python
+    objects per step. Here steps are appended to preallocated typed column
+    buffers and flushed to disk as memory-mapped .npy segments, so a
+    million-episode run is written and reread without per-step objects.
+
+Storage Layout:
+    directory/
+        segment_00000/
+            state.npy, action.npy, reward.npy, ...   one file per column
+            episodes.npy                             episode index
+        segment_00001/
+        ...
+
+    Each segment holds whole episodes only: when the buffer fills, finished
+    episodes are flushed and the open episode moves to the front of the
+    buffer. The episode index (start, length, npc_mood per episode) is local
+    to its segment, so readers slice episodes as zero-copy views.
+
+Methodological Notes:
+    - state is the GridStateCodec index the action was taken in; the next
+      state is the following row (episodes end on the row with done=True)
+    - Arousal columns are NaN when the agent does not report arousal
+    - Segments are written once and never modified, so a reader can open a
+      run while it is still being recorded
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+# Per-step columns and their on-disk dtypes
+STEP_COLUMNS: dict[str, type] = {
+    "state": np.int32,
+    "action": np.int8,
+    "reward": np.float64,
+    "done": np.bool_,
+    "state_error": np.float32,
+    "agent_error": np.float32,
+    "state_arousal": np.float32,
+    "agent_arousal": np.float32,
+}
+
+# Per-episode index entry (start is local to the segment)
+EPISODE_DTYPE = np.dtype(
+    [("start", np.int64), ("length", np.int32), ("npc_mood", np.int8)]
+)
+
+_SEGMENT_GLOB = "segment_*"
+_INDEX_FILE = "episodes.npy"
+
+
+class TrajectoryRecorder:
+    """
+    Append-only step recorder backed by preallocated column buffers.
+
+    Usage Pattern:
+        with TrajectoryRecorder("runs/seed0") as recorder:
+            recorder.begin_episode(npc_mood=env.current_mood.value)
+            index, reward, done = env.step_fast(action)
+            recorder.record(state, action, reward, done, ...)
+
+    Implementation Notes:
+        - record() writes scalars into the buffers; record_episode() appends
+          a whole episode of arrays at once
+        - An episode longer than segment_steps grows the buffer instead of
+          being split across segments
+        - close() flushes the buffer; an unfinished episode is kept as a
+          truncated episode (its last row has done=False)
+    """
+
+    def __init__(self, directory: str | Path, segment_steps: int = 1 << 20):
+        """
+        Create a recorder writing into an empty (or new) directory.
+
+        Args:
+            directory: Output directory for segments
+            segment_steps: Buffer capacity in steps (steps per segment file)
+        """
+        if segment_steps < 1:
+            raise ValueError(f"segment_steps must be positive, got {segment_steps}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if any(self.directory.glob(_SEGMENT_GLOB)):
+            raise FileExistsError(f"{self.directory} already contains trajectory segments")
+
+        self._buffers = {
+            name: np.empty(segment_steps, dtype) for name, dtype in STEP_COLUMNS.items()
+        }
+        self._size = 0  # Steps in buffer
+        self._episode_start = 0  # Buffer offset of the open episode
+        self._episode_mood = -1
+        self._episodes: list[tuple[int, int, int]] = []  # Finished episodes in buffer
+
+        self.n_segments = 0
+        self.n_steps = 0
+        self.n_episodes = 0
+        self._closed = False
+
+    @property
+    def capacity(self) -> int:
+        return self._buffers["state"].size
+
+    def begin_episode(self, npc_mood: int = -1) -> None:
+        """
+        Label the next episode with the actual NPC mood (-1 = not recorded).
+
+        Optional: record() opens an unlabelled episode implicitly.
+        """
+        if self._size > self._episode_start:
+            raise RuntimeError("begin_episode() called in the middle of an episode")
+        self._episode_mood = npc_mood
+
+    def record(
+        self,
+        state: int,
+        action: int,
+        reward: float,
+        done: bool,
+        state_error: float = 0.0,
+        agent_error: float = 0.0,
+        state_arousal: float = np.nan,
+        agent_arousal: float = np.nan,
+    ) -> None:
+        """Append one step; done=True closes the episode."""
+        if self._size == self.capacity:
+            self._make_room(1)
+
+        i = self._size
+        buffers = self._buffers
+        buffers["state"][i] = state
+        buffers["action"][i] = action
+        buffers["reward"][i] = reward
+        buffers["done"][i] = done
+        buffers["state_error"][i] = state_error
+        buffers["agent_error"][i] = agent_error
+        buffers["state_arousal"][i] = state_arousal
+        buffers["agent_arousal"][i] = agent_arousal
+        self._size = i + 1
+
+        if done:
+            self._close_episode()
+
+    def record_episode(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        state_errors: np.ndarray | None = None,
+        agent_errors: np.ndarray | None = None,
+        state_arousal: np.ndarray | None = None,
+        agent_arousal: np.ndarray | None = None,
+        npc_mood: int = -1,
+    ) -> None:
+        """
+        Append a complete episode from per-step arrays (e.g. a finished
+        vector-environment lane). The last step is marked done.
+        """
+        if self._size > self._episode_start:
+            raise RuntimeError("record_episode() called in the middle of an episode")
+
+        n = len(actions)
+        if n == 0:
+            raise ValueError("Cannot record an empty episode")
+        self._make_room(n)
+
+        columns = {
+            "state": states,
+            "action": actions,
+            "reward": rewards,
+            "state_error": 0.0 if state_errors is None else state_errors,
+            "agent_error": 0.0 if agent_errors is None else agent_errors,
+            "state_arousal": np.nan if state_arousal is None else state_arousal,
+            "agent_arousal": np.nan if agent_arousal is None else agent_arousal,
+        }
+        window = slice(self._size, self._size + n)
+        for name, values in columns.items():
+            self._buffers[name][window] = values
+        self._buffers["done"][window] = False
+        self._buffers["done"][self._size + n - 1] = True
+
+        self._size += n
+        self._episode_mood = npc_mood
+        self._close_episode()
+
+    def flush(self) -> None:
+        """Write finished episodes in the buffer to a new segment."""
+        if not self._episodes:
+            return
+
+        n = self._episode_start
+        segment = self.directory / f"segment_{self.n_segments:05d}"
+        segment.mkdir()
+        for name, buffer in self._buffers.items():
+            column = np.lib.format.open_memmap(
+                segment / f"{name}.npy", mode="w+", dtype=buffer.dtype, shape=(n,)
+            )
+            column[:] = buffer[:n]
+            column.flush()
+            del column
+        # Index last: a segment without an index is incomplete and ignored by readers
+        np.save(segment / _INDEX_FILE, np.array(self._episodes, dtype=EPISODE_DTYPE))
+
+        self.n_segments += 1
+        self.n_steps += n
+        self.n_episodes += len(self._episodes)
+        self._episodes = []
+
+        # Move the open episode to the front of the buffer
+        open_steps = self._size - n
+        for buffer in self._buffers.values():
+            buffer[:open_steps] = buffer[n:self._size]
+        self._size = open_steps
+        self._episode_start = 0
+
+    def close(self) -> None:
+        """Flush everything, keeping an unfinished episode as truncated."""
+        if self._closed:
+            return
+        if self._size > self._episode_start:
+            self._close_episode()
+        self.flush()
+        self._closed = True
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _close_episode(self) -> None:
+        length = self._size - self._episode_start
+        self._episodes.append((self._episode_start, length, self._episode_mood))
+        self._episode_start = self._size
+        self._episode_mood = -1
+
+    def _make_room(self, n: int) -> None:
+        """Guarantee n free buffer slots, flushing or growing as needed."""
+        if self._size + n <= self.capacity:
+            return
+        self.flush()
+        if self._size + n > self.capacity:
+            # Single episode longer than a segment: grow instead of splitting it
+            new_capacity = max(2 * self.capacity, self._size + n)
+            for name, buffer in self._buffers.items():
+                grown = np.empty(new_capacity, dtype=buffer.dtype)
+                grown[:self._size] = buffer[:self._size]
+                self._buffers[name] = grown
+
+
+class TrajectoryReader:
+    """
+    Read-only access to a recorded run.
+
+    Column files are memory-mapped, so opening a run costs only the episode
+    index; step data is paged in as it is touched.
+    """
+
+    def __init__(self, directory: str | Path, mmap: bool = True):
+        """
+        Open every complete segment in a recorder directory.
+
+        Args:
+            directory: Directory written by TrajectoryRecorder
+            mmap: Memory-map columns (False reads them into memory)
+        """
+        self.directory = Path(directory)
+        mode = "r" if mmap else None
+
+        self.segments: list[dict[str, np.ndarray]] = []
+        indices = []
+        for segment in sorted(self.directory.glob(_SEGMENT_GLOB)):
+            if not (segment / _INDEX_FILE).exists():
+                continue  # Still being written
+            self.segments.append(
+                {name: np.load(segment / f"{name}.npy", mmap_mode=mode) for name in STEP_COLUMNS}
+            )
+            indices.append(np.load(segment / _INDEX_FILE))
+
+        index = np.concatenate(indices) if indices else np.empty(0, dtype=EPISODE_DTYPE)
+        self.episode_start = index["start"]
+        self.episode_length = index["length"]
+        self.episode_mood = index["npc_mood"]
+        self.episode_segment = np.repeat(
+            np.arange(len(indices), dtype=np.int32), [len(i) for i in indices]
+        )
+
+    def __len__(self) -> int:
+        return self.episode_length.size
+
+    @property
+    def n_steps(self) -> int:
+        return int(self.episode_length.sum())
+
+    def episode(self, i: int) -> dict[str, np.ndarray]:
+        """Columns of episode i as zero-copy views."""
+        segment = self.segments[self.episode_segment[i]]
+        start = int(self.episode_start[i])
+        window = slice(start, start + int(self.episode_length[i]))
+        return {name: column[window] for name, column in segment.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        """One column over the whole run (concatenated into memory)."""
+        if name not in STEP_COLUMNS:
+            raise KeyError(f"Unknown column {name!r}; expected one of {list(STEP_COLUMNS)}")
+        if not self.segments:
+            return np.empty(0, dtype=STEP_COLUMNS[name])
+        return np.concatenate([segment[name] for segment in self.segments])
+
+    def iter_segments(self) -> Iterator[dict[str, np.ndarray]]:
+        """Segment columns one at a time (bounded memory for large runs)."""
+        yield from self.segments
+
+    def episode_returns(self) -> np.ndarray:
+        """Summed reward per episode, reduced segment by segment."""
+        returns = np.empty(len(self))
+        counts = np.bincount(self.episode_segment, minlength=len(self.segments))
+        offset = 0
+        for segment, count in zip(self.segments, counts):
+            starts = self.episode_start[offset:offset + count]
+            returns[offset:offset + count] = np.add.reduceat(segment["reward"], starts)
+            offset += count
+        return returns
@@ -0,0 +1,122 @@
+"""
+Async Vector Environment Tests
+
+Methodological Purpose:
+    Worker-process stepping must give the same per-lane results as stepping
+    the scalar environments directly, and shared buffers must be released.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from src.environment.async_vector import _BUFFER_DTYPES, AsyncVectorSocialGridWorld
+from src.environment.social_gridworld import Action, SimpleSocialGridWorld
+
+
+def test_async_matches_scalar_lanes():
+    """
+    Verify each lane reproduces a SimpleSocialGridWorld with the lane's seed,
+    including autoreset and episode statistics.
+    """
+    num_envs = 5
+    lane_seeds = np.random.SeedSequence(11).spawn(num_envs)
+    envs = [SimpleSocialGridWorld(seed=s, max_steps=8) for s in lane_seeds]
+    rng = np.random.default_rng(0)
+
+    with AsyncVectorSocialGridWorld(num_envs, num_workers=2, seed=11, max_steps=8) as venv:
+        obs = venv.reset()
+        assert list(obs) == [env.reset_fast() for env in envs]
+        returns = np.zeros(num_envs)
+
+        for _ in range(30):
+            actions = rng.integers(0, len(Action), size=num_envs)
+            venv.step_async(actions)
+            result = venv.step_wait()
+
+            for lane, env in enumerate(envs):
+                index, reward, done = env.step_fast(int(actions[lane]))
+                returns[lane] += reward
+                assert result.final_obs[lane] == index
+                assert result.reward[lane] == reward
+                assert result.done[lane] == done
+                assert result.state_error[lane] == env.last_state_error
+                assert result.agent_error[lane] == env.last_agent_error
+                if done:
+                    assert result.episode_return[lane] == pytest.approx(returns[lane])
+                    assert result.obs[lane] == env.reset_fast()
+                    returns[lane] = 0.0
+
+    print("✓ Async lanes match scalar environments")
+
+
+def test_async_protocol_errors():
+    """Verify misuse of step_async/step_wait is rejected."""
+    venv = AsyncVectorSocialGridWorld(2, num_workers=1, seed=0)
+    try:
+        venv.reset()
+        with pytest.raises(RuntimeError):
+            venv.step_wait()
+        with pytest.raises(ValueError):
+            venv.step_async(np.full(2, 9))
+        venv.step_async(np.zeros(2, dtype=int))
+        with pytest.raises(RuntimeError):
+            venv.step_async(np.zeros(2, dtype=int))
+        venv.step_wait()
+    finally:
+        venv.close()
+
+    with pytest.raises(RuntimeError):
+        venv.reset()
+
+
+def test_async_startup_error_releases_shared_memory(monkeypatch):
+    """Bad env_kwargs surface as a worker traceback and leak no shared memory."""
+    created = []
+    original_init = SharedMemory.__init__
+
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        if kwargs.get("create"):
+            created.append(self.name)
+
+    monkeypatch.setattr(SharedMemory, "__init__", tracking_init)
+
+    with pytest.raises(RuntimeError, match="max_stpes"):
+        AsyncVectorSocialGridWorld(2, num_workers=2, seed=0, max_stpes=8)
+
+    assert len(created) == len(_BUFFER_DTYPES)
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+    print("✓ Worker startup errors are reported and shared memory released")
+
+
+def test_async_close_after_failed_step(monkeypatch):
+    """A pending step that failed in a worker, or whose worker died, still closes cleanly."""
+
+    def failing_step(self, action):
+        raise RuntimeError("lane exploded")
+
+    # Forked workers inherit the patched method
+    monkeypatch.setattr(SimpleSocialGridWorld, "step_fast", failing_step)
+    failed = AsyncVectorSocialGridWorld(2, num_workers=2, seed=0, context="fork")
+    failed.reset()
+    failed.step_async(np.zeros(2, dtype=int))
+    monkeypatch.undo()
+
+    killed = AsyncVectorSocialGridWorld(2, num_workers=2, seed=0)
+    killed.reset()
+    killed.step_async(np.zeros(2, dtype=int))
+    killed._processes[0].kill()
+    killed._processes[0].join()
+
+    for venv in (failed, killed):
+        names = [block.name for block in venv._blocks]
+        venv.close()
+        assert not any(process.is_alive() for process in venv._processes)
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                SharedMemory(name=name)
+    print("✓ close() releases workers and shared memory after a failed step")
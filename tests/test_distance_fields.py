@@ -0,0 +1,150 @@
+"""
+Distance Field Tests
+
+Methodological Purpose:
+    Path efficiency and shaping are only meaningful if the BFS distances are
+    the true shortest paths under the environment's own movement rules
+    (walls included), and if the cached fields are shared, not recomputed.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from src.environment.distance_fields import path_efficiency, potential_shaping
+from src.environment.layout import layout_from_ascii
+from src.environment.social_gridworld import N_MOOD_ESTIMATES, SimpleSocialGridWorld
+from src.environment.vector_gridworld import VectorSocialGridWorld
+
+WALLS = [
+    ".....",
+    ".#.#.",
+    ".....",
+    ".####",
+    ".....",
+]
+
+
+def _reference_distances(env, target_cells):
+    """Plain breadth-first search from the targets over free cells of env.tables."""
+    n_cells = env.size * env.size
+    walls = np.asarray(env.walls).ravel()
+    distance = {cell: 0 for cell in target_cells}
+    queue = deque(target_cells)
+    while queue:
+        cell = queue.popleft()
+        for other in range(n_cells):
+            if other not in distance and not walls[other] and cell in env.tables.next_cell[other]:
+                distance[other] = distance[cell] + 1
+                queue.append(other)
+    return np.array([distance.get(cell, -1) for cell in range(n_cells)])
+
+
+def _greedy_policy(env):
+    """Codec-indexed policy that always moves one step closer to the goal."""
+    to_goal = env.distance_fields.to_goal
+    cells = np.arange(env.size * env.size * N_MOOD_ESTIMATES) // N_MOOD_ESTIMATES
+    return np.argmin(to_goal[env.tables.next_cell[cells, :4]], axis=1)
+
+
+def test_distance_fields_match_reference_bfs():
+    """Vectorized BFS equals a textbook BFS, walls and NPC neighbourhood included."""
+    env = SimpleSocialGridWorld(walls=layout_from_ascii(WALLS), seed=0)
+    fields = env.distance_fields
+
+    goal_cell = env.goal_pos[1] * env.size + env.goal_pos[0]
+    assert np.array_equal(fields.to_goal, _reference_distances(env, [goal_cell]))
+    npc_cells = np.flatnonzero((env.tables.adjacent_npc >= 0) & ~env.walls.ravel()).tolist()
+    assert np.array_equal(fields.to_npc, _reference_distances(env, npc_cells))
+    assert (fields.to_goal[np.asarray(env.walls).ravel()] == -1).all(), "Walls are unreachable"
+    print("✓ Distance fields match reference BFS")
+
+
+def test_distance_fields_scale_to_large_mazes():
+    """
+    On a serpentine maze (diameter ~ cells / 2) every reachable cell is
+    exactly one move further than its best neighbour.
+    """
+    size = 401
+    walls = np.zeros((size, size), dtype=bool)
+    for y in range(1, size, 2):
+        walls[y] = True
+        walls[y, size - 1 if y % 4 == 1 else 0] = False  # Gap alternates sides
+    env = SimpleSocialGridWorld(
+        size=size, walls=walls, goal_position=(0, 0), npc_position=(size // 2, 0)
+    )
+
+    to_goal = env.distance_fields.to_goal
+    free = ~walls.ravel()
+    assert (to_goal[free] >= 0).all() and (to_goal[~free] == -1).all()
+    assert to_goal.max() > size * size // 4, "Corridor path, not Manhattan distance"
+
+    neighbours = to_goal[env.tables.next_cell[:, :4]]
+    best = np.where(neighbours >= 0, neighbours, np.iinfo(np.int32).max).min(axis=1)
+    inner = free & (to_goal > 0)
+    assert np.array_equal(to_goal[inner], best[inner] + 1)
+    print("✓ Distance fields scale to large mazes")
+
+
+def test_distance_fields_cached_per_layout():
+    """Environments with the same layout share one read-only copy of the fields."""
+    first = SimpleSocialGridWorld(seed=0).distance_fields
+    second = SimpleSocialGridWorld(seed=1).distance_fields
+    assert first.to_goal is second.to_goal
+    assert not first.to_goal.flags.writeable
+
+    walled = SimpleSocialGridWorld(walls=layout_from_ascii(WALLS)).distance_fields
+    assert not np.array_equal(first.to_goal, walled.to_goal)
+    print("✓ Distance fields are cached by layout")
+
+
+def test_path_efficiency_of_greedy_rollout():
+    """Descending the goal field is a shortest path: efficiency exactly 1."""
+    env = SimpleSocialGridWorld(walls=layout_from_ascii(WALLS), seed=0)
+    result = env.rollout(_greedy_policy(env), n_episodes=200)
+    assert result.success.all()
+
+    efficiency = path_efficiency(
+        env.distance_fields, result.start_cells, result.lengths, result.success
+    )
+    assert np.array_equal(efficiency, np.ones(200))
+
+    fields = env.distance_fields
+    failed = path_efficiency(fields, result.start_cells, result.lengths + 3, ~result.success)
+    assert np.isnan(failed).all(), "Episodes that miss the goal have no efficiency"
+    print("✓ Greedy rollouts have path efficiency 1")
+
+
+def test_potential_shaping_telescopes():
+    """Undiscounted shaping sums to -phi(start) over every terminated episode."""
+    env = SimpleSocialGridWorld(seed=3)
+    potential = env.distance_fields.potential()
+    rng = np.random.default_rng(3)
+
+    cells, done, starts = [], [], []
+    for _ in range(20):
+        state = env.reset_fast()
+        starts.append(state // N_MOOD_ESTIMATES)
+        finished = False
+        while not finished:
+            cells.append(state // N_MOOD_ESTIMATES)
+            state, _, finished = env.step_fast(int(rng.integers(0, 5)))
+            done.append(finished)
+
+    shaping = potential_shaping(potential, np.array(cells), np.array(done))
+    episode_starts = np.flatnonzero(np.concatenate([[True], done[:-1]]))
+    totals = np.add.reduceat(shaping, episode_starts)
+    assert np.allclose(totals, -potential[starts])
+    print("✓ Potential shaping telescopes over episodes")
+
+
+def test_vector_distance_fields_match_scalar():
+    """Stacked per-lane fields agree with each lane's scalar environment."""
+    goals = np.array([(4, 4), (0, 4), (4, 0)])
+    vec = VectorSocialGridWorld(num_envs=3, goal_position=goals, seed=0)
+    vec.reset()
+
+    for lane, goal in enumerate(goals):
+        env = SimpleSocialGridWorld(goal_position=tuple(goal))
+        assert vec.distance_to_goal()[lane] == env.distance_fields.to_goal[vec.agent_cell[lane]]
+    print("✓ Vector distance fields match scalar environments")
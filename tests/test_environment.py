@@ -9,7 +9,14 @@ Methodological Purpose:
     4. Mood dynamics function as specified
 """
 
-from src.environment.social_gridworld import Action, NPCMood, SimpleSocialGridWorld
+import pickle
+import sys
+
+import numpy as np
+
+from src.environment.layout import layout_from_ascii
+from src.environment.social_gridworld import Action, GridState, NPCMood, SimpleSocialGridWorld
+from src.environment.state_codec import GridStateCodec
 
 
 def test_environment_initialization():
@@ -40,14 +47,11 @@ def test_navigation_mechanics():
 def test_interaction_mechanics():
     """Verify Agent domain mechanics work correctly."""
     env = SimpleSocialGridWorld(seed=42)
-    state = env.reset()
+    env.reset()
 
-    # Force NPC to be hostile
+    # Force NPC to be hostile, agent adjacent to NPC
     env.current_mood = NPCMood.HOSTILE
-    state.npc_mood_actual = NPCMood.HOSTILE
-
-    # Move adjacent to NPC
-    state.agent_pos = (2, 1)  # Above NPC at (2,2)
+    env.set_state(npc_mood_actual=NPCMood.HOSTILE, agent_pos=(2, 1))  # Above NPC at (2,2)
 
     # Interact
     transition = env.step(Action.INTERACT)
@@ -61,10 +65,10 @@ def test_interaction_mechanics():
 def test_goal_reaching():
     """Verify goal reward is awarded correctly."""
     env = SimpleSocialGridWorld(seed=42)
-    state = env.reset()
+    env.reset()
 
     # Place agent adjacent to goal
-    state.agent_pos = (3, 4)  # Next to goal at (4,4)
+    env.set_state(agent_pos=(3, 4))  # Next to goal at (4,4)
 
     transition = env.step(Action.RIGHT)
 
@@ -98,26 +102,283 @@ def test_domain_error_attribution():
     env.reset()
 
     # Test State domain error (wall collision)
-    state = env.reset()
-    state.agent_pos = (0, 0)  # Corner
+    env.reset()
+    env.set_state(agent_pos=(0, 0))  # Corner
     transition_wall = env.step(Action.LEFT)  # Try to go through wall
 
     assert transition_wall.info["state_error"] > 0, "Wall collision is State error"
     assert transition_wall.info["agent_error"] == 0, "Wall collision not Agent error"
 
     # Test Agent domain error (hostile interaction)
-    state = env.reset()
+    env.reset()
     env.current_mood = NPCMood.HOSTILE
-    state.npc_mood_actual = NPCMood.HOSTILE
-    state.agent_pos = (2, 1)  # Adjacent to NPC
+    env.set_state(npc_mood_actual=NPCMood.HOSTILE, agent_pos=(2, 1))  # Adjacent to NPC
 
     transition_hostile = env.step(Action.INTERACT)
 
     assert transition_hostile.info["agent_error"] > 0, "Hostile interaction is Agent error"
 
+    # Typed channels decompose the reward by domain
+    for transition in (transition_wall, transition_hostile):
+        channels = transition.channels
+        assert np.isclose(channels.state_reward + channels.agent_reward, transition.reward)
+    assert transition_wall.channels.agent_reward == 0.0
+    assert transition_hostile.channels.agent_reward == -5.0
+
     print("✓ Domain error attribution correct")
 
 
+def test_movement_tables():
+    """Verify precomputed tables encode boundaries and NPC adjacency."""
+    env = SimpleSocialGridWorld(seed=42)
+    tables = env.tables
+    corner = 0  # (0, 0)
+
+    assert tables.next_cell.shape == (env.size * env.size, len(Action))
+    assert tables.wall_hit[corner, Action.LEFT.value], "Leaving grid is a wall hit"
+    assert tables.next_cell[corner, Action.LEFT.value] == corner, "Wall hit stays in place"
+    assert tables.next_cell[corner, Action.RIGHT.value] == 1
+    assert tables.next_cell[corner, Action.DOWN.value] == env.size
+
+    above_npc = 1 * env.size + 2  # (2, 1)
+    assert tables.npc_contact[above_npc, Action.INTERACT.value]
+    assert not tables.npc_contact[above_npc, Action.UP.value], "Only INTERACT contacts NPC"
+    assert not tables.npc_contact[corner, Action.INTERACT.value]
+    print("✓ Movement tables correct")
+
+
+def test_step_fast_matches_step():
+    """Verify the allocation-free path reproduces step() exactly."""
+    env = SimpleSocialGridWorld(mood_change_frequency=3, seed=7)
+    fast_env = SimpleSocialGridWorld(mood_change_frequency=3, seed=7)
+    codec = GridStateCodec.from_env(env)
+    actions = list(Action)
+
+    for episode in range(10):
+        env.reset()
+        index = fast_env.reset_fast()
+        assert index == codec.encode(env.state)
+
+        for t in range(50):
+            action = actions[(episode * 7 + t * 3) % len(actions)]
+            transition = env.step(action)
+            index, reward, done = fast_env.step_fast(action.value)
+
+            assert index == codec.encode(transition.next_state)
+            assert reward == transition.reward
+            assert done == transition.done
+            assert fast_env.last_state_error == transition.info["state_error"]
+            assert fast_env.last_agent_error == transition.info["agent_error"]
+            if done:
+                break
+
+    print("✓ step_fast matches step")
+
+
+def test_snapshot_restore_branching():
+    """Verify restoring a snapshot replays identical dynamics, across episodes."""
+    env = SimpleSocialGridWorld(mood_change_frequency=2, seed=3)
+    env.reset()
+    env.step(Action.RIGHT)
+    snapshot = env.get_snapshot()
+    actions = [Action.DOWN, Action.INTERACT, Action.LEFT, Action.UP, Action.RIGHT] * 12
+
+    def branch():
+        outcomes = []
+        for action in actions:
+            outcomes.append(env.step_fast(action.value))
+            if outcomes[-1][2]:
+                outcomes.append(env.reset_fast())
+        return outcomes
+
+    first = branch()
+    env.restore_snapshot(snapshot)
+    second = branch()
+
+    assert first == second, "Branch from snapshot should be reproducible"
+    env.restore_snapshot(snapshot)
+    assert env.state.steps == 1
+    print("✓ Snapshot/restore functional")
+
+
+def test_multi_npc_interaction():
+    """Verify each NPC answers interaction with its own mood."""
+    env = SimpleSocialGridWorld(
+        size=7, npc_positions=[(1, 1), (5, 5)], goal_position=(6, 0), seed=0
+    )
+    env.reset()
+    snapshot = env.get_snapshot()._replace(
+        npc_moods=(NPCMood.HOSTILE.value, NPCMood.FRIENDLY.value)
+    )
+
+    env.restore_snapshot(snapshot._replace(agent_cell=1 * 7 + 2))  # (2, 1): next to NPC 0
+    _, reward_first, _ = env.step_fast(Action.INTERACT.value)
+    assert env.state.npc_mood_estimate == NPCMood.HOSTILE
+    assert env.last_agent_error > 0
+
+    env.restore_snapshot(snapshot._replace(agent_cell=5 * 7 + 4))  # (4, 5): next to NPC 1
+    _, reward_second, _ = env.step_fast(Action.INTERACT.value)
+    assert env.state.npc_mood_estimate == NPCMood.FRIENDLY
+    assert reward_second > 0 > reward_first
+
+    starts = set(env.start_cells.tolist())
+    assert not starts & {1 * 7 + 1, 5 * 7 + 5, 0 * 7 + 6}, "Never start on NPCs or goal"
+    print("✓ Multi-NPC interaction functional")
+
+
+def test_large_grid_many_npcs():
+    """Verify 1000x1000 grids with many NPCs build and step through tables."""
+    npcs = [(i * 37 % 1000, i * 91 % 1000) for i in range(200)]
+    env = SimpleSocialGridWorld(
+        size=1000, npc_positions=npcs, goal_position=(999, 999), mood_change_frequency=2,
+        seed=0,
+    )
+    assert env.tables.next_cell.shape == (1000 * 1000, len(Action))
+
+    initial = env.npc_moods.copy()
+    for _ in range(2):
+        env.reset_fast()
+        for action in (Action.RIGHT, Action.DOWN, Action.INTERACT):
+            env.step_fast(action.value)
+
+    assert np.all(env.npc_moods != initial), "Every NPC changes mood"
+    assert len(set(env.npc_moods.tolist())) > 1, "NPC moods drawn independently"
+    print("✓ Large-grid multi-NPC mode functional")
+
+
+def test_obstacle_layout():
+    """Verify walls block movement, are masked out and never host a start cell."""
+    walls = layout_from_ascii([
+        ".....",
+        ".#...",
+        ".....",
+        "...#.",
+        ".....",
+    ])
+    env = SimpleSocialGridWorld(walls=walls, seed=0)
+    assert not np.isin(env.start_cells, [1 * 5 + 1, 3 * 5 + 3]).any()
+
+    start = env.get_snapshot()._replace(agent_cell=1 * 5 + 0, initialized=True)
+    env.restore_snapshot(start)
+    assert not env.action_mask()[Action.RIGHT.value], "Move into wall is masked"
+    assert env.action_mask()[Action.UP.value]
+    assert not env.action_mask()[Action.INTERACT.value], "No NPC adjacent"
+
+    index, reward, _ = env.step_fast(Action.RIGHT.value)
+    assert env.state.agent_pos == (0, 1), "Wall blocks movement"
+    assert reward == -1.1 and env.last_state_error == 1.0
+
+    # Mask agrees with the collision table everywhere
+    moves = env.valid_actions[:, :Action.INTERACT.value]
+    assert np.array_equal(moves, ~env.tables.wall_hit[:, :Action.INTERACT.value])
+
+    try:
+        SimpleSocialGridWorld(walls=layout_from_ascii(["....."] * 4 + ["....#"]))
+        raise AssertionError("Goal on a wall must be rejected")
+    except ValueError:
+        pass
+    print("✓ Obstacle layouts block movement and expose action masks")
+
+
+def test_rollout_matches_step_loop():
+    """Critical Test: lockstep rollout reproduces the reset/step loop exactly."""
+    rng = np.random.default_rng(0)
+    policy = rng.integers(0, len(Action), size=5 * 5 * 4)
+    policy[rng.random(policy.size) < 0.5] = Action.RIGHT.value
+
+    fast = SimpleSocialGridWorld(seed=3, mood_change_frequency=4)
+    result = fast.rollout(policy, 30)
+
+    env = SimpleSocialGridWorld(seed=3, mood_change_frequency=4)
+    for episode in range(30):
+        index = env.reset_fast()
+        assert result.moods[episode] == env.current_mood.value
+        total, length, done, reward = 0.0, 0, False, 0.0
+        while not done:
+            index, reward, done = env.step_fast(int(policy[index]))
+            total += reward
+            length += 1
+        assert np.isclose(result.returns[episode], total)
+        assert result.lengths[episode] == length
+        assert result.success[episode] == (reward >= 9.0)
+
+    assert fast.episode_count == env.episode_count
+    assert np.array_equal(fast.npc_moods, env.npc_moods)
+    print("✓ Rollout matches per-step execution")
+
+
+def test_grid_state_immutable_value_type():
+    """GridState is immutable, hashable by value and internable on request."""
+    env = SimpleSocialGridWorld(seed=0)
+    state = env.reset()
+    assert env.state is state, "Repeated access yields the cached object"
+
+    rebuilt = GridStateCodec.from_env(env).decode(
+        env.state_index, npc_mood_actual=state.npc_mood_actual
+    )
+    assert rebuilt == state and hash(rebuilt) == hash(state)
+    assert pickle.loads(pickle.dumps(state)) == state
+    assert {state: 1}[rebuilt] == 1
+
+    assert rebuilt.intern() is state.intern(), "Equal states share one interned object"
+    GridState.clear_interned()
+
+    for mutate in (lambda: setattr(state, "agent_pos", (0, 0)),
+                   lambda: delattr(state, "agent_pos")):
+        try:
+            mutate()
+            raise AssertionError("GridState must be immutable")
+        except AttributeError:
+            pass
+    moved = state.replace(agent_pos=(0, 0))
+    assert moved.agent_pos == (0, 0) and state.agent_pos != (0, 0)
+    assert sys.getsizeof(state) <= 128
+    print("✓ GridState immutable and hashable")
+
+
+def test_int_coded_actions_and_moods():
+    """Plain ints and uint8 codes work wherever Action/NPCMood members do."""
+    env = SimpleSocialGridWorld(seed=0)
+    env.reset()
+    env.set_state(agent_pos=(2, 1), npc_mood_actual=int(NPCMood.HOSTILE))
+    assert env.state.npc_mood_actual is NPCMood.HOSTILE, "Int moods normalized to members"
+
+    transition = env.step(int(Action.INTERACT))
+    assert transition.action is Action.INTERACT
+    assert transition.next_state.npc_mood_estimate == NPCMood.HOSTILE == 2
+
+    _, reward, _ = env.step_fast(np.uint8(Action.UP))
+    assert env.state.agent_pos == (2, 0) and np.isclose(reward, -0.1)
+
+    codec = GridStateCodec.from_env(env)
+    assert codec.encode(env.state.replace(npc_mood_estimate=2)) == env.state_index
+
+    assert env.state.replace(npc_mood_estimate=-1).npc_mood_estimate is None, "-1 = unknown"
+    for bad in ({"npc_mood_estimate": 3}, {"npc_mood_actual": -1}):
+        try:
+            env.state.replace(**bad)
+            raise AssertionError(f"Out-of-range mood code accepted: {bad}")
+        except ValueError:
+            pass
+
+    env.current_mood = 2
+    assert env.current_mood is NPCMood.HOSTILE
+    env.current_mood = np.int8(0)
+    assert env.current_mood is NPCMood.FRIENDLY
+    print("✓ Int-coded actions and moods accepted")
+
+
+def test_render_friendly_estimate():
+    """FRIENDLY (code 0) is a real belief and must be rendered."""
+    env = SimpleSocialGridWorld(seed=0)
+    env.reset()
+    env.set_state(agent_pos=(2, 1), npc_mood_actual=NPCMood.FRIENDLY)
+    env.step(Action.INTERACT)
+    assert env.state.npc_mood_estimate is NPCMood.FRIENDLY
+    assert "(Agent believes: FRIENDLY)" in env.render()
+    print("✓ Friendly mood estimate rendered")
+
+
 def test_optimal_policy_exists():
     """
     Philosophical Verification: Confirm environment is solvable.
@@ -189,6 +450,16 @@ if __name__ == "__main__":
     test_goal_reaching()
     test_mood_change_dynamics()
     test_domain_error_attribution()
+    test_movement_tables()
+    test_step_fast_matches_step()
+    test_snapshot_restore_branching()
+    test_multi_npc_interaction()
+    test_large_grid_many_npcs()
+    test_obstacle_layout()
+    test_rollout_matches_step_loop()
+    test_grid_state_immutable_value_type()
+    test_int_coded_actions_and_moods()
+    test_render_friendly_estimate()
     test_optimal_policy_exists()
 
     print("=" * 60)
@@ -0,0 +1,76 @@
+"""
+Episode Statistics Tests
+
+Methodological Purpose:
+    Learning curves and convergence metrics read episode returns from the
+    environment, so the bounded tracker must agree with a full history on
+    everything it retains and summarize everything it has seen.
+"""
+
+import numpy as np
+
+from src.environment.episode_stats import EpisodeStats
+from src.environment.social_gridworld import Action, SimpleSocialGridWorld
+
+
+def test_ring_buffer_and_running_moments():
+    """Critical Test: bounded memory, exact summaries over all episodes."""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(5.0, 3.0, size=1000)
+    lengths = rng.integers(1, 50, size=1000)
+    success = rng.random(1000) < 0.3
+
+    stats = EpisodeStats(capacity=64, window=20)
+    for r, n, s in zip(returns, lengths, success):
+        stats.add(r, n, s)
+
+    assert len(stats) == 64 and stats.count == 1000
+    assert np.array_equal(stats.returns(), returns[-64:])
+    assert np.array_equal(stats.lengths(), lengths[-64:])
+    assert np.isclose(stats.mean_return, returns.mean())
+    assert np.isclose(stats.var_return, returns.var(ddof=1))
+    assert np.isclose(stats.mean_length, lengths.mean())
+    assert np.isclose(stats.success_rate, success[-20:].mean())
+
+    batched = EpisodeStats(capacity=64, window=20)
+    for chunk in np.array_split(np.arange(1000), 7):
+        batched.add_batch(returns[chunk], lengths[chunk], success[chunk])
+    for name, column in stats.to_arrays().items():
+        assert np.array_equal(batched.to_arrays()[name], column)
+    assert np.isclose(batched.var_return, stats.var_return)
+    assert batched.success_rate == stats.success_rate
+    print("✓ Ring buffer and running moments agree with full history")
+
+
+def test_environment_tracks_episode_returns():
+    """Environment records whole-episode returns, not terminal rewards."""
+    env = SimpleSocialGridWorld(seed=0, stats_capacity=8)
+    totals = []
+    for _ in range(12):
+        env.reset_fast()
+        total, done = 0.0, False
+        while not done:
+            _, reward, done = env.step_fast(Action.RIGHT.value)
+            total += reward
+        totals.append(total)
+
+    assert len(env.episode_stats) == 8 and env.episode_stats.count == 12
+    assert np.allclose(env.episode_stats.returns(), totals[-8:])
+    print("✓ Environment tracks bounded episode returns")
+
+
+def test_batched_success_window_small_batches():
+    """Batches smaller than the window update the success rate incrementally."""
+    rng = np.random.default_rng(1)
+    success = rng.random(500) < 0.4
+    for capacity, window in [(64, 20), (16, 16)]:
+        batched = EpisodeStats(capacity=capacity, window=window)
+        start = 0
+        while start < success.size:
+            n = int(rng.integers(0, 6))
+            chunk = success[start:start + n]
+            batched.add_batch(np.zeros(chunk.size), np.ones(chunk.size), chunk)
+            start += chunk.size
+            if start:
+                assert batched.success_rate == success[max(0, start - window):start].mean()
+    print("✓ Batched success window matches full history")
@@ -0,0 +1,87 @@
+"""
+Obstacle Layout Tests
+
+Methodological Purpose:
+    Layout files are shared between workers through memory mapping; the
+    round trip must preserve the occupancy array exactly, and walled
+    environments must stay consistent with their exact tabular export.
+"""
+
+import numpy as np
+import pytest
+
+from src.environment.layout import layout_from_ascii, load_layout, save_layout
+from src.environment.social_gridworld import SimpleSocialGridWorld
+from src.environment.tabular_mdp import export_tabular_mdp
+from src.environment.vector_gridworld import VectorSocialGridWorld
+
+WALLS = [
+    ".....",
+    ".#.#.",
+    ".....",
+    ".#...",
+    ".....",
+]
+
+
+def test_layout_memmap_round_trip(tmp_path):
+    """Saved layouts load back bit-identical as read-only memory maps."""
+    walls = layout_from_ascii(WALLS)
+    path = save_layout(tmp_path / "rooms", walls)
+    assert path.suffix == ".npy"
+
+    mapped = load_layout(path)
+    assert isinstance(mapped, np.memmap) and not mapped.flags.writeable
+    assert np.array_equal(mapped, walls)
+
+    env = SimpleSocialGridWorld(walls=mapped, seed=0)
+    assert env.walls is mapped, "Environment keeps the shared mapping, no copy"
+    env.reset_fast()
+    assert "#" in env.render()
+    print("✓ Layout files round-trip through memory mapping")
+
+
+def test_vector_env_walls_match_scalar():
+    """Vector lanes collide with walls exactly like the scalar environment."""
+    walls = layout_from_ascii(WALLS)
+    vec = VectorSocialGridWorld(num_envs=4, walls=walls, seed=[0, 1, 2, 3], autoreset=True)
+    envs = [SimpleSocialGridWorld(walls=walls, seed=s) for s in range(4)]
+
+    obs = vec.reset()
+    assert np.array_equal(obs, [env.reset_fast() for env in envs])
+
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        actions = rng.integers(0, 5, size=4)
+        assert np.array_equal(vec.action_masks(), [env.action_mask() for env in envs])
+        result = vec.step(actions)
+        for lane, env in enumerate(envs):
+            index, reward, done = env.step_fast(int(actions[lane]))
+            assert index == result.final_obs[lane] and reward == result.reward[lane]
+            if done:
+                env.reset_fast()
+    print("✓ Vector walls match scalar environment")
+
+
+def test_mdp_cache_key_includes_walls(tmp_path):
+    """Same layout parameters with different walls map to different cache entries."""
+    export_tabular_mdp(SimpleSocialGridWorld(), cache_dir=tmp_path)
+    export_tabular_mdp(SimpleSocialGridWorld(walls=layout_from_ascii(WALLS)), cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("mdp_*.npz"))) == 2
+    print("✓ Walls are part of the MDP cache key")
+
+
+def test_walled_goal_or_npc_rejected_by_both_envs():
+    """Both constructors apply the same layout checks, per lane in the vector env."""
+    walls = layout_from_ascii(WALLS)
+    walls[0, 4] = True  # Cell (4, 0)
+
+    with pytest.raises(ValueError, match="wall"):
+        SimpleSocialGridWorld(walls=walls, goal_position=(4, 0))
+    with pytest.raises(ValueError, match="wall"):
+        VectorSocialGridWorld(2, walls=walls, goal_position=np.array([(4, 4), (4, 0)]))
+    with pytest.raises(ValueError, match="wall"):
+        VectorSocialGridWorld(2, walls=walls, npc_position=np.array([(2, 2), (4, 0)]))
+    with pytest.raises(ValueError, match="shape"):
+        VectorSocialGridWorld(2, walls=np.zeros((4, 4), dtype=bool))
+    print("✓ Walled goals and NPCs are rejected by scalar and vector envs")
@@ -0,0 +1,158 @@
+"""
+Optimal-Value Oracle Tests
+
+Methodological Purpose:
+    M1 convergence is measured against the oracle's optimum, so the oracle
+    must be exact: following its policy in the real environment must realize
+    exactly V* from every start cell and mood.
+"""
+
+import numpy as np
+import pytest
+
+from src.environment.social_gridworld import N_MOOD_ESTIMATES, NPCMood, SimpleSocialGridWorld
+from src.environment.tabular_mdp import N_INTERACTION_LEVELS, export_tabular_mdp
+from src.utils.mdp_solver import (
+    evaluate_policies,
+    evaluate_policies_discounted,
+    value_iteration,
+)
+
+
+def _mdp_state(env, n_obs):
+    snapshot = env.get_snapshot()
+    level = min(snapshot.interaction_count, N_INTERACTION_LEVELS - 1)
+    return level * n_obs + env.state_index
+
+
+def test_optimal_policy_realizes_v_star():
+    """Critical Test: optimal policy achieves V* in the environment."""
+    env = SimpleSocialGridWorld(seed=0)
+    mdp = export_tabular_mdp(env)
+    solution = value_iteration(mdp)
+    n_obs = mdp.n_states // N_INTERACTION_LEVELS
+    env.reset_fast()
+
+    for mood in NPCMood:
+        for start in mdp.start_states:
+            env.restore_snapshot(env.get_snapshot()._replace(
+                agent_cell=int(start) // N_MOOD_ESTIMATES,
+                npc_moods=(mood.value,),
+                mood_estimate=-1,
+                interaction_count=0,
+                steps=0,
+            ))
+            total = 0.0
+            for t in range(env.max_steps):
+                action = solution.policy[t, mood.value, _mdp_state(env, n_obs)]
+                _, reward, done = env.step_fast(int(action))
+                total += reward
+                if done:
+                    break
+
+            assert total == pytest.approx(solution.v_star[mood.value, start])
+
+    print("✓ Optimal policy realizes V*")
+
+
+def test_hostile_optimum_is_shortest_path():
+    """Verify hostile-mood optimum equals walking the shortest path to the goal."""
+    env = SimpleSocialGridWorld(seed=0)
+    mdp = export_tabular_mdp(env)
+    solution = value_iteration(mdp)
+
+    cells = mdp.start_states // N_MOOD_ESTIMATES
+    goal_x, goal_y = env.goal_pos
+    distance = np.abs(cells % env.size - goal_x) + np.abs(cells // env.size - goal_y)
+    expected = 10.0 - 0.1 * distance
+
+    assert np.allclose(solution.v_star[NPCMood.HOSTILE.value, mdp.start_states], expected)
+    assert solution.start_return[NPCMood.HOSTILE.value] == pytest.approx(expected.mean())
+    assert np.allclose(solution.q_star.max(axis=2), solution.v_star)
+
+
+def test_value_iteration_scales_to_large_grid():
+    """Verify a grid with thousands of cells solves in one call."""
+    env = SimpleSocialGridWorld(
+        size=60, npc_position=(30, 30), goal_position=(59, 59), max_steps=200, seed=0
+    )
+    solution = value_iteration(export_tabular_mdp(env))
+
+    assert solution.v_star.shape == (3, 60 * 60 * N_MOOD_ESTIMATES * N_INTERACTION_LEVELS)
+    assert np.all(np.isfinite(solution.start_return))
+
+
+def test_policy_evaluation_matches_rollouts():
+    """
+    Critical Test: exact evaluation equals simulated episodes.
+
+    Within an episode the environment is deterministic, so one rollout per
+    (policy, mood, start cell) is the exact expected return.
+    """
+    env = SimpleSocialGridWorld(seed=0, max_steps=20)
+    mdp = export_tabular_mdp(env)
+    rng = np.random.default_rng(3)
+    policies = rng.integers(0, 5, size=(4, int(mdp.observation.max()) + 1))
+
+    evaluation = evaluate_policies(mdp, policies)
+    assert evaluation.returns.shape == (4, 3, mdp.start_states.size)
+    goal_cell = env.goal_pos[1] * env.size + env.goal_pos[0]
+    env.reset_fast()
+
+    for p, policy in enumerate(policies):
+        for mood in NPCMood:
+            for c, start in enumerate(mdp.start_states):
+                env.restore_snapshot(env.get_snapshot()._replace(
+                    agent_cell=int(start) // N_MOOD_ESTIMATES, npc_moods=(mood.value,),
+                    mood_estimate=-1, interaction_count=0, steps=0,
+                ))
+                index = env.state_index
+                total, reached = 0.0, False
+                for _ in range(env.max_steps):
+                    cell = index // N_MOOD_ESTIMATES
+                    index, reward, done = env.step_fast(int(policy[index]))
+                    total += reward
+                    if done:
+                        reached = goal_cell in (cell, index // N_MOOD_ESTIMATES)
+                        break
+
+                assert evaluation.returns[p, mood.value, c] == pytest.approx(total)
+                assert evaluation.success[p, mood.value, c] == float(reached)
+
+    single = evaluate_policies(mdp, policies[0])
+    assert np.allclose(single.mean_return, evaluation.mean_return[0])
+    print("✓ Exact policy evaluation matches rollouts")
+
+
+def test_discounted_linear_solve_matches_iteration():
+    """Verify the sparse linear solve equals the long-horizon recursion."""
+    mdp = export_tabular_mdp(SimpleSocialGridWorld(seed=0))
+    policies = np.random.default_rng(0).integers(0, 5, size=(3, int(mdp.observation.max()) + 1))
+
+    solved = evaluate_policies_discounted(mdp, policies, gamma=0.9)
+    iterated = evaluate_policies(mdp, policies, gamma=0.9, horizon=600).returns
+
+    assert np.allclose(solved, iterated)
+    with pytest.raises(ValueError):
+        evaluate_policies_discounted(mdp, policies, gamma=1.0)
+
+
+def test_exhaustive_start_evaluation_matches_oracle():
+    """One batched episode per (mood, start cell) reproduces exact evaluation."""
+    env = SimpleSocialGridWorld(seed=0)
+    mdp = export_tabular_mdp(env)
+    policy = np.random.default_rng(4).integers(0, 5, size=int(mdp.observation.max()) + 1)
+
+    exact = evaluate_policies(mdp, policy)
+    exhaustive = env.evaluate_all_starts(policy)
+
+    assert exhaustive.returns.shape == (len(NPCMood), env.start_cells.size)
+    assert np.allclose(exhaustive.returns, exact.returns)
+    assert np.array_equal(exhaustive.success, exact.success.astype(bool))
+    assert exhaustive.mean_return == pytest.approx(exact.mean_return.mean())
+    assert exhaustive.weights.sum() == pytest.approx(1.0)
+    assert env.episode_count == 0 and env.episode_stats.count == 0, "Evaluation is pure"
+
+    hostile_only = env.evaluate_all_starts(policy, mood_weights=[0.0, 0.0, 1.0])
+    assert hostile_only.mean_return == pytest.approx(exact.mean_return[NPCMood.HOSTILE])
+    print("✓ Exhaustive start evaluation matches the oracle")
@@ -0,0 +1,90 @@
+"""
+Mood Schedule Tests
+
+Methodological Purpose:
+    Adaptation metrics are sliced at mood-change episodes, so a precomputed
+    schedule must reproduce the live mood draws exactly and be served the
+    same way by scalar and batched environments.
+"""
+
+import numpy as np
+import pytest
+
+from src.environment.social_gridworld import (
+    NPCMood,
+    SimpleSocialGridWorld,
+    mood_change_episodes,
+)
+from src.environment.vector_gridworld import VectorSocialGridWorld
+
+
+def _live_moods(env, n_episodes):
+    moods = []
+    for _ in range(n_episodes):
+        env.reset_fast()
+        moods.append(env.npc_moods.copy())
+    return np.array(moods)
+
+
+def test_precomputed_schedule_matches_live_draws():
+    """Critical Test: installing the generated schedule does not change the run."""
+    positions = [(1, 1), (3, 3), (0, 4)]
+    live = _live_moods(
+        SimpleSocialGridWorld(seed=5, mood_change_frequency=3, npc_positions=positions), 40
+    )
+
+    env = SimpleSocialGridWorld(seed=5, mood_change_frequency=3, npc_positions=positions)
+    schedule = env.precompute_mood_schedule(40)
+    assert np.array_equal(schedule, live)
+    assert np.array_equal(_live_moods(env, 40), live)
+    assert np.array_equal(env.mood_change_episodes, np.arange(3, 41, 3))
+
+    with pytest.raises(RuntimeError):
+        env.reset_fast()  # Episode 41 is past the schedule
+    print("✓ Precomputed schedule reproduces live mood changes")
+
+
+def test_explicit_schedule_scalar_and_vector():
+    """A given schedule is served by index in scalar and batched modes."""
+    hostile, friendly = NPCMood.HOSTILE.value, NPCMood.FRIENDLY.value
+    schedule = np.array([hostile, hostile, friendly, friendly, hostile])
+    assert list(mood_change_episodes(schedule)) == [1, 3, 5]
+
+    env = SimpleSocialGridWorld(mood_schedule=schedule, seed=0)
+    assert list(_live_moods(env, 5)[:, 0]) == list(schedule)
+
+    vec = VectorSocialGridWorld(num_envs=3, mood_schedule=schedule, seed=0)
+    served = []
+    for _ in range(5):
+        vec.reset()
+        served.append(vec.moods.copy())
+    assert np.array_equal(np.array(served), np.repeat(schedule[:, None], 3, axis=1))
+    print("✓ Explicit schedule served identically by scalar and vector envs")
+
+
+def test_vector_precomputed_schedule_matches_lanes():
+    """Per-lane vector schedules equal each lane's live mood sequence."""
+    seeds = [11, 12, 13, 14]
+    vec = VectorSocialGridWorld(num_envs=4, seed=seeds, mood_change_frequency=2)
+    schedule = vec.precompute_mood_schedule(20)
+    for lane, seed in enumerate(seeds):
+        env = SimpleSocialGridWorld(seed=seed, mood_change_frequency=2)
+        assert np.array_equal(schedule[lane], _live_moods(env, 20)[:, 0])
+    print("✓ Vector schedules match per-lane live draws")
+
+
+def test_vector_mood_change_episodes_per_lane():
+    """Per-lane change episodes match the scalar environment with the lane's seed."""
+    seeds = [21, 22, 23]
+    vec = VectorSocialGridWorld(num_envs=3, seed=seeds, mood_change_frequency=[3, 5, 7])
+    vec.precompute_mood_schedule(40)
+    for lane, (seed, freq) in enumerate(zip(seeds, [3, 5, 7])):
+        env = SimpleSocialGridWorld(seed=seed, mood_change_frequency=freq)
+        env.precompute_mood_schedule(40)
+        changes = vec.mood_change_episodes(lane)
+        assert np.array_equal(changes, env.mood_change_episodes)
+        assert np.array_equal(changes, np.arange(freq, 41, freq)), "Episode numbers, not lanes"
+
+    with pytest.raises(RuntimeError):
+        VectorSocialGridWorld(num_envs=2).mood_change_episodes(0)
+    print("✓ Vector mood change episodes reported per lane")
@@ -0,0 +1,82 @@
+"""
+Counter-Based Seeding Tests
+
+Methodological Purpose:
+    Episode k of seed s must see identical start positions and mood changes
+    regardless of batching, process count or execution order. Otherwise
+    re-chunking the sweep across workers silently changes results.
+"""
+
+import numpy as np
+
+from src.environment.seeding import STREAM_START, counter_integers, lane_keys
+from src.environment.social_gridworld import SimpleSocialGridWorld
+from src.environment.vector_gridworld import VectorSocialGridWorld
+
+
+def _scalar_trace(seed, n_episodes, **kwargs):
+    env = SimpleSocialGridWorld(seed=seed, **kwargs)
+    cells, moods = [], []
+    for _ in range(n_episodes):
+        env.reset_fast()
+        cells.append(env.state.agent_pos)
+        moods.append(env.current_mood.value)
+    return cells, moods
+
+
+def test_lanes_independent_of_batching():
+    """Verify a lane's episodes depend only on its seed, not its batch."""
+    seeds = [3, 17, 17, 99]
+    n_episodes = 40
+
+    full = VectorSocialGridWorld(num_envs=4, mood_change_frequency=3, seed=seeds)
+    halves = [
+        VectorSocialGridWorld(num_envs=2, mood_change_frequency=3, seed=seeds[:2]),
+        VectorSocialGridWorld(num_envs=2, mood_change_frequency=3, seed=seeds[2:]),
+    ]
+
+    traces = [_scalar_trace(s, n_episodes, mood_change_frequency=3) for s in seeds]
+
+    for episode in range(n_episodes):
+        full.reset()
+        for half in halves:
+            half.reset()
+        split_pos = np.concatenate([half.agent_pos for half in halves])
+        split_moods = np.concatenate([half.moods for half in halves])
+
+        assert np.array_equal(full.agent_pos, split_pos)
+        assert np.array_equal(full.moods, split_moods)
+        for lane, (cells, moods) in enumerate(traces):
+            assert tuple(full.agent_pos[lane]) == cells[episode]
+            assert full.moods[lane] == moods[episode]
+
+    assert np.array_equal(full.agent_pos[1], full.agent_pos[2]), "Same seed, same episodes"
+    print("✓ Lane streams independent of batching")
+
+
+def test_root_seed_spawn_tree():
+    """Verify lane i of a root seed matches SeedSequence(seed, spawn_key=(i,))."""
+    venv = VectorSocialGridWorld(num_envs=3, seed=5)
+    children = np.random.SeedSequence(5).spawn(3)
+    traces = [_scalar_trace(child, 10) for child in children]
+
+    for episode in range(10):
+        venv.reset()
+        for lane, (cells, _) in enumerate(traces):
+            assert tuple(venv.agent_pos[lane]) == cells[episode]
+
+    print("✓ Root seed spawns per-lane streams")
+
+
+def test_counter_draws_order_independent():
+    """Verify draws are pure functions of (key, episode, stream, draw)."""
+    keys = lane_keys(1, 8)
+    episodes = np.arange(1, 9)
+
+    forward = counter_integers(keys, episodes, STREAM_START, 25)
+    backward = counter_integers(keys[::-1], episodes[::-1], STREAM_START, 25)[::-1]
+    single = [counter_integers(k, e, STREAM_START, 25)[0] for k, e in zip(keys, episodes)]
+
+    assert np.array_equal(forward, backward)
+    assert np.array_equal(forward, single)
+    assert np.all((forward >= 0) & (forward < 25))
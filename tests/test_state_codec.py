@@ -0,0 +1,82 @@
+"""
+State Codec Tests
+
+Methodological Purpose:
+    Tabular agents index Q-tables with GridStateCodec. The codec must be a
+    bijection on observable states, agree between scalar and batch paths,
+    and stay dense in [0, n_states).
+"""
+
+import numpy as np
+import pytest
+
+from src.environment.social_gridworld import NPCMood, SimpleSocialGridWorld
+from src.environment.state_codec import GridStateCodec
+
+
+def test_codec_round_trip():
+    """Verify encode(decode(i)) == i for every index."""
+    codec = GridStateCodec()
+
+    for index in range(codec.n_states):
+        state = codec.decode(index)
+        assert codec.encode(state) == index
+
+    print("✓ Codec round trip exact")
+
+
+def test_codec_dense_and_unique():
+    """Verify every observable state maps to a distinct index in range."""
+    env = SimpleSocialGridWorld(seed=0)
+    codec = GridStateCodec.from_env(env)
+    state = env.reset()
+
+    seen = set()
+    for y in range(env.size):
+        for x in range(env.size):
+            for estimate in [None, *NPCMood]:
+                seen.add(codec.encode(state.replace(agent_pos=(x, y), npc_mood_estimate=estimate)))
+
+    assert seen == set(range(codec.n_states)), "Indices should be dense"
+    print("✓ Codec dense and unique")
+
+
+def test_codec_batch_matches_scalar():
+    """Verify batch encode/decode agree with the scalar path."""
+    codec = GridStateCodec()
+    rng = np.random.default_rng(0)
+    cells = rng.integers(0, codec.n_cells, size=100)
+    estimates = rng.integers(-1, len(NPCMood), size=100)
+
+    indices = codec.encode_batch(cells, estimates)
+    for index, cell, estimate in zip(indices, cells, estimates):
+        state = codec.decode(int(index))
+        assert codec.pos_to_cell(state.agent_pos) == cell
+        assert (state.npc_mood_estimate is None) == (estimate == -1)
+
+    decoded_cells, decoded_estimates = codec.decode_batch(indices)
+    assert np.array_equal(decoded_cells, cells)
+    assert np.array_equal(decoded_estimates, estimates)
+    print("✓ Codec batch path consistent")
+
+
+def test_codec_rejects_foreign_layout():
+    """Verify states from a different layout are rejected."""
+    codec = GridStateCodec(goal_position=(0, 0))
+    state = SimpleSocialGridWorld(seed=0).reset()
+
+    with pytest.raises(ValueError):
+        codec.encode(state)
+
+
+def test_codec_rejects_off_grid_positions():
+    """Off-grid agents would alias another cell's index; encode refuses them."""
+    env = SimpleSocialGridWorld(seed=0)
+    codec = GridStateCodec.from_env(env)
+    state = env.reset()
+
+    for position in [(5, 0), (0, 5), (-1, 2), (2, -1)]:
+        with pytest.raises(ValueError, match="outside"):
+            codec.encode(state.replace(agent_pos=position))
+    assert codec.decode(codec.encode(state.replace(agent_pos=(4, 0)))).agent_pos == (4, 0)
+    print("✓ Off-grid positions rejected")
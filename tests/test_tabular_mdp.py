@@ -0,0 +1,83 @@
+"""
+Tabular MDP Export Tests
+
+Methodological Purpose:
+    Exact planning and policy evaluation are only as good as the exported
+    dynamics. Every (mood, state, action) entry is checked against
+    SimpleSocialGridWorld.step_fast.
+"""
+
+import numpy as np
+
+from src.environment.social_gridworld import (
+    N_MOOD_ESTIMATES,
+    Action,
+    NPCMood,
+    SimpleSocialGridWorld,
+)
+from src.environment.tabular_mdp import (
+    N_INTERACTION_LEVELS,
+    dense_transitions,
+    export_tabular_mdp,
+    sparse_transitions,
+)
+
+
+def test_mdp_matches_environment():
+    """Critical Test: exported transitions reproduce step_fast exactly."""
+    env = SimpleSocialGridWorld(seed=0, max_steps=1000)
+    mdp = export_tabular_mdp(env)
+    n_obs = mdp.n_states // N_INTERACTION_LEVELS
+    env.reset_fast()
+
+    for mood in NPCMood:
+        for state in range(mdp.n_states):
+            level, obs = divmod(state, n_obs)
+            cell, estimate_code = divmod(obs, N_MOOD_ESTIMATES)
+            for action in Action:
+                snapshot = env.get_snapshot()._replace(
+                    agent_cell=cell,
+                    npc_moods=(mood.value,),
+                    mood_estimate=estimate_code - 1,
+                    interaction_count=level,
+                    steps=0,
+                )
+                env.restore_snapshot(snapshot)
+                index, reward, done = env.step_fast(action.value)
+
+                successor = mdp.next_state[mood.value, state, action.value]
+                assert mdp.observation[successor] == index
+                assert mdp.reward[mood.value, state, action.value] == reward
+                assert mdp.terminal[mood.value, state, action.value] == done
+
+    print("✓ Exported MDP matches environment dynamics")
+
+
+def test_mdp_views_and_start_states():
+    """Verify dense/sparse views agree and start states are unknown-mood, level 0."""
+    mdp = export_tabular_mdp(SimpleSocialGridWorld(seed=0))
+    transitions = dense_transitions(mdp)
+
+    assert np.allclose(transitions.sum(axis=-1), 1.0), "Rows must be distributions"
+    for mood in NPCMood:
+        csr = sparse_transitions(mdp, mood)
+        assert np.array_equal(csr.toarray(), transitions[mood.value].reshape(-1, mdp.n_states))
+
+    assert mdp.start_states.size == 23
+    assert np.all(mdp.observation[mdp.start_states] % N_MOOD_ESTIMATES == 0)
+    assert np.all(mdp.start_states < mdp.n_states // N_INTERACTION_LEVELS)
+
+
+def test_mdp_disk_cache(tmp_path):
+    """Verify exports are cached per layout and reloaded identically."""
+    env = SimpleSocialGridWorld(seed=0)
+    first = export_tabular_mdp(env, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("mdp_*.npz"))) == 1
+
+    cached = export_tabular_mdp(SimpleSocialGridWorld(seed=99), cache_dir=tmp_path)
+    for name in ("next_state", "reward", "terminal", "goal_reached", "start_states"):
+        assert np.array_equal(getattr(first, name), getattr(cached, name))
+    assert cached.max_steps == first.max_steps
+
+    export_tabular_mdp(SimpleSocialGridWorld(goal_position=(0, 4)), cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("mdp_*.npz"))) == 2, "Different layout, different entry"
@@ -0,0 +1,187 @@
+"""
+Vectorized Environment Tests
+
+Methodological Purpose:
+    VectorSocialGridWorld must be a drop-in batched replacement for
+    SimpleSocialGridWorld. These tests verify lane-wise equivalence of the
+    reward logic and domain error attribution against the scalar environment.
+"""
+
+import numpy as np
+import pytest
+
+from src.environment.social_gridworld import Action, NPCMood, SimpleSocialGridWorld
+from src.environment.vector_gridworld import VectorSocialGridWorld
+
+
+def test_vector_reset_start_positions():
+    """Verify no lane starts at the goal or the NPC."""
+    venv = VectorSocialGridWorld(num_envs=256, seed=0)
+    observations = venv.reset()
+
+    assert observations.shape == (256,)
+    assert not np.any(venv.agent_cell == venv.goal_cell), "No lane should start at goal"
+    assert not np.any(venv.agent_cell == venv.npc_cell), "No lane should start at NPC"
+    assert np.all(venv.mood_estimates == -1), "Mood should be unknown initially"
+    print("✓ Vector reset correct")
+
+
+def test_vector_reset_covers_start_cells():
+    """Verify batched reset samples every permissible start cell."""
+    venv = VectorSocialGridWorld(num_envs=2000, seed=1)
+    venv.reset()
+
+    assert venv.start_cells.size == venv.size * venv.size - 2
+    assert set(venv.agent_cell.tolist()) == set(venv.start_cells.tolist())
+    print("✓ Batched reset covers all start cells")
+
+
+def test_vector_step_matches_scalar():
+    """
+    Critical Test: Every lane reproduces SimpleSocialGridWorld.step.
+
+    The scalar environment is placed in the same state as each lane before
+    stepping, so rewards, termination and error channels must agree exactly.
+    """
+    rng = np.random.default_rng(7)
+    venv = VectorSocialGridWorld(num_envs=64, seed=3)
+    venv.reset()
+    env = SimpleSocialGridWorld(seed=3)
+
+    for _ in range(30):
+        venv.moods[:] = rng.integers(0, len(NPCMood), size=venv.num_envs)
+        actions = rng.integers(0, len(Action), size=venv.num_envs, dtype=np.uint8)
+
+        expected = []
+        for lane in range(venv.num_envs):
+            env.reset()
+            env.set_state(
+                agent_pos=tuple(int(v) for v in venv.agent_pos[lane]),
+                npc_mood_actual=venv.moods[lane],
+                interaction_count=int(venv.interaction_counts[lane]),
+                steps=int(venv.steps[lane]),
+            )
+            expected.append(env.step(actions[lane]))
+
+        result = venv.step(actions)
+
+        for lane, transition in enumerate(expected):
+            assert result.reward[lane] == transition.reward
+            assert result.done[lane] == transition.done
+            assert result.state_error[lane] == transition.info["state_error"]
+            assert result.agent_error[lane] == transition.info["agent_error"]
+            assert result.state_reward[lane] == np.float32(transition.channels.state_reward)
+            assert result.agent_reward[lane] == np.float32(transition.channels.agent_reward)
+            assert tuple(venv.agent_pos[lane]) == transition.next_state.agent_pos
+
+        if result.done.any():
+            venv.reset(result.done)
+
+    print("✓ Vector step matches scalar step lane-wise")
+
+
+def test_vector_mood_change_dynamics():
+    """Verify each lane changes NPC mood at the configured frequency."""
+    venv = VectorSocialGridWorld(num_envs=16, mood_change_frequency=5, seed=42)
+    initial = venv.moods.copy()
+
+    for _ in range(5):
+        venv.reset()
+        venv.step(np.full(venv.num_envs, Action.UP.value))
+
+    assert np.all(venv.moods != initial), "Mood should change after frequency threshold"
+    print("✓ Vector mood dynamics functional")
+
+
+def test_vector_autoreset_bookkeeping():
+    """
+    Verify finished lanes restart inside step() and report episode statistics.
+
+    Episode returns are checked against a manual accumulation of per-step
+    rewards; restarted lanes must be back at step 0 with unknown mood.
+    """
+    rng = np.random.default_rng(1)
+    venv = VectorSocialGridWorld(num_envs=32, max_steps=10, seed=5, autoreset=True)
+    venv.reset()
+    running = np.zeros(venv.num_envs)
+    lengths = np.zeros(venv.num_envs, dtype=np.int32)
+    finished = 0
+
+    for _ in range(40):
+        actions = rng.integers(0, len(Action), size=venv.num_envs)
+        result = venv.step(actions)
+        running += result.reward
+        lengths += 1
+
+        done = result.done
+        assert np.allclose(result.episode_return[done], running[done])
+        assert np.array_equal(result.episode_length[done], lengths[done])
+        assert np.all(venv.steps[done] == 0), "Finished lanes should be reset"
+        assert np.all(venv.mood_estimates[done] == -1)
+        assert np.array_equal(result.obs, venv.observations())
+        assert np.array_equal(result.obs[~done], result.final_obs[~done])
+
+        finished += int(done.sum())
+        running[done] = 0.0
+        lengths[done] = 0
+
+    assert finished > venv.num_envs, "Timeouts should have ended several episodes"
+    print("✓ Vector autoreset bookkeeping correct")
+
+
+def test_heterogeneous_lane_parameters():
+    """Critical Test: lanes with different parameters match their scalar twins."""
+    n = 6
+    params = {
+        "npc_position": np.array([(2, 2), (1, 3), (2, 2), (3, 1), (1, 3), (2, 2)]),
+        "goal_position": np.array([(4, 4), (0, 4), (4, 0), (4, 4), (0, 4), (4, 4)]),
+        "mood_change_frequency": np.array([2, 3, 2, 5, 3, 7]),
+        "max_steps": np.array([6, 9, 12, 6, 9, 20]),
+    }
+    seeds = list(range(100, 100 + n))
+    venv = VectorSocialGridWorld(num_envs=n, seed=seeds, autoreset=True, **params)
+    assert len(venv.layouts) == 4, "Identical layouts share one table block"
+
+    envs = [
+        SimpleSocialGridWorld(
+            seed=seeds[lane],
+            npc_position=tuple(params["npc_position"][lane]),
+            goal_position=tuple(params["goal_position"][lane]),
+            mood_change_frequency=int(params["mood_change_frequency"][lane]),
+            max_steps=int(params["max_steps"][lane]),
+        )
+        for lane in range(n)
+    ]
+
+    obs = venv.reset()
+    assert list(obs) == [env.reset_fast() for env in envs]
+
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        actions = rng.integers(0, len(Action), size=n)
+        result = venv.step(actions)
+        for lane, env in enumerate(envs):
+            index, reward, done = env.step_fast(int(actions[lane]))
+            assert index == result.final_obs[lane]
+            assert reward == result.reward[lane] and done == result.done[lane]
+            if done:
+                assert env.reset_fast() == result.obs[lane]
+                assert env.current_mood.value == venv.moods[lane]
+    print("✓ Heterogeneous lanes match per-parameter scalar environments")
+
+
+def test_out_of_range_actions_rejected():
+    """Vector and scalar envs reject the same invalid action codes."""
+    vec = VectorSocialGridWorld(num_envs=2, seed=0)
+    vec.reset()
+    env = SimpleSocialGridWorld(seed=0)
+    env.reset()
+
+    for code in (-1, len(Action)):
+        with pytest.raises(ValueError, match="Action code"):
+            vec.step(np.array([code, Action.UP]))
+        with pytest.raises(ValueError, match="Action code"):
+            env.step_fast(code)
+    assert (vec.interaction_counts == 0).all() and (vec.steps == 0).all(), "Nothing stepped"
+    assert env.state.steps == 0
+    print("✓ Out-of-range action codes rejected")